@@ -0,0 +1,53 @@
+"""
+Benchmark for LogParser.parse_computations on computation-heavy logs.
+
+Two layouts are timed: every counter line directly before its computation
+line, and counter lines of eight threads logged ahead of their computation
+lines, so the nearest same-thread counter line is several rows back.
+
+Run from the repository root:  python benchmarks/computations.py
+"""
+
+import sys
+import time
+from os import path
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "src"))
+
+import numpy as np  # noqa: E402
+from app.log_parser import LogParser  # noqa: E402
+from synthetic import COMPUTATION, NOISE, generate_logs  # noqa: E402
+
+SCALES = [100_000, 1_000_000]
+
+
+def interleave(logs):
+    """Reorder two-row computation units so threads interleave in blocks of 8."""
+    unit = np.arange(len(logs)) // 2
+    order = np.lexsort((unit, np.arange(len(logs)) % 2, unit // 8))
+    return logs.iloc[order].reset_index(drop=True)
+
+
+def main():
+    print(f"{'rows':>10} {'layout':>12} {'seconds':>9} {'rows / s':>12} {'matched':>8}")
+    for rows in SCALES:
+        adjacent = generate_logs(rows, shares={COMPUTATION: 1.0})
+        with_noise = generate_logs(rows, shares={COMPUTATION: 0.8, NOISE: 0.2})
+        for layout, logs in [
+            ("adjacent", adjacent),
+            ("interleaved", interleave(adjacent)),
+            ("with noise", with_noise),
+        ]:
+            parser = LogParser(logs)
+            start = time.perf_counter()
+            computations = parser.parse_computations()
+            elapsed = time.perf_counter() - start
+            matched = computations["Invocations Count"].notna().mean()
+            print(
+                f"{len(logs):>10,} {layout:>12} {elapsed:>9.3f} "
+                f"{len(logs) / elapsed:>12,.0f} {matched:>8.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
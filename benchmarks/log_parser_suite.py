@@ -0,0 +1,124 @@
+"""
+LogParser benchmark suite over synthetic logs.
+
+Times each parser stage and records its peak traced memory. Results can be
+saved and later compared against, failing when a stage regresses.
+
+    python benchmarks/log_parser_suite.py --rows 1000000 --output base.json
+    python benchmarks/log_parser_suite.py --rows 1000000 --baseline base.json
+    python benchmarks/log_parser_suite.py --stages construct --workers 16
+
+Peak memory is measured in a second, traced run of each stage so tracing
+overhead does not leak into the timings.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from os import path
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "src"))
+
+from app.log_parser import LogParser  # noqa: E402
+from synthetic import generate_logs  # noqa: E402
+
+STAGES = {
+    "construct": lambda logs, parser: LogParser(logs, workers=parser.workers),
+    "filter_relevant_logs": lambda logs, parser: parser.filter_relevant_logs(),
+    "parse_plugins": lambda logs, parser: parser.parse_plugins(),
+    "parse_plugin_summary": lambda logs, parser: parser.parse_plugin_summary(),
+    "parse_queries": lambda logs, parser: parser.parse_queries(),
+    "parse_computations": lambda logs, parser: parser.parse_computations(),
+}
+
+
+def measure(stage, logs, parser, repeat: int) -> dict:
+    """Best wall time of ``repeat`` runs and the peak traced memory of one."""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage(logs, parser)
+        seconds.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    stage(logs, parser)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": min(seconds), "peak_mib": peak / 2**20}
+
+
+def run(rows: int, repeat: int, stages: list, seed: int, workers: int = 1) -> dict:
+    logs = generate_logs(rows, seed=seed)
+    parser = LogParser(logs, workers=workers)
+    results = {}
+    for name in stages:
+        results[name] = measure(STAGES[name], logs, parser, repeat)
+        print(
+            f"{name:>22} {results[name]['seconds']:>9.3f}s "
+            f"{results[name]['peak_mib']:>10.1f} MiB",
+            flush=True,
+        )
+    return {"rows": len(logs), "seed": seed, "workers": workers, "stages": results}
+
+
+def regressions(current: dict, baseline: dict, tolerance: float) -> list:
+    """Stages whose time or peak memory grew beyond ``tolerance``."""
+    found = []
+    for name, result in current["stages"].items():
+        before = baseline["stages"].get(name)
+        if before is None:
+            continue
+        for metric in ["seconds", "peak_mib"]:
+            if result[metric] > before[metric] * tolerance:
+                found.append(
+                    f"{name} {metric}: {before[metric]:.3f} -> {result[metric]:.3f}"
+                )
+    return found
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arguments.add_argument("--rows", type=int, default=1_000_000)
+    arguments.add_argument("--repeat", type=int, default=3)
+    arguments.add_argument("--seed", type=int, default=0)
+    arguments.add_argument(
+        "--workers", type=int, default=1, help="processes used to classify messages"
+    )
+    arguments.add_argument("--stages", nargs="+", choices=list(STAGES))
+    arguments.add_argument("--output", help="save results as JSON")
+    arguments.add_argument("--baseline", help="JSON results to compare against")
+    arguments.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="allowed growth factor before a stage counts as regressed",
+    )
+    options = arguments.parse_args()
+
+    print(f"{options.rows:,} rows, {options.workers} workers, best of {options.repeat}")
+    results = run(
+        options.rows,
+        options.repeat,
+        options.stages or list(STAGES),
+        options.seed,
+        options.workers,
+    )
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        if baseline["rows"] != results["rows"]:
+            sys.exit(f"baseline has {baseline['rows']:,} rows, not {results['rows']:,}")
+        found = regressions(results, baseline, options.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
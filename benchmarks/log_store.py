@@ -0,0 +1,40 @@
+"""
+Cold (CSV parse) against warm (memory-mapped Arrow table) log loads.
+
+Run from the repository root:  python benchmarks/log_store.py [rows]
+"""
+
+import sys
+import tempfile
+import time
+from os import path
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "src"))
+
+from app import log_store  # noqa: E402
+from app.log_cache import content_hash  # noqa: E402
+from read_log import write_log  # noqa: E402
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        log_store.STORE_DIR = path.join(tmp, "store")
+        file_path = path.join(tmp, "log.csv")
+        write_log(file_path, rows)
+        print(f"{rows:,} rows, {path.getsize(file_path) / 2**20:.1f} MiB")
+
+        with open(file_path, "rb") as f:
+            file_hash = content_hash(f)
+            for run in ["cold", "warm"]:
+                f.seek(0)
+                start = time.perf_counter()
+                parser = log_store.load_parser(f, file_hash)
+                elapsed = time.perf_counter() - start
+                print(f"{run:>5} {elapsed:>8.2f}s  ({len(parser.logs):,} rows)")
+        stored = log_store.store_path(file_hash)
+        print(f"table {path.getsize(stored) / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Scaling benchmark for LogParser.match_plugin_sessions.
+
+Run from the repository root:  python benchmarks/plugin_sessions.py
+"""
+
+import sys
+import time
+from os import path
+
+sys.path.insert(0, path.join(path.dirname(__file__), "..", "src"))
+
+from pandas import DataFrame  # noqa: E402
+from app.log_parser import LogParser  # noqa: E402
+
+SCALES = [1_000, 10_000, 100_000]
+PLUGIN_NAMES = 50
+RIDS = 20
+
+
+def build_logs(plugin_runs: int) -> DataFrame:
+    """Interleaved start/end pairs, two plugins in flight at a time."""
+    rows = []
+    for run in range(0, plugin_runs, 2):
+        pair = [run, run + 1]
+        for i in pair:
+            rows.append(
+                (
+                    f"r{i % RIDS}",
+                    f"Started executing plug-in instance [{i}]: Plugin{i % PLUGIN_NAMES}",
+                )
+            )
+        for i in pair:
+            rows.append((f"r{i % RIDS}", "Starting user code execution"))
+        for i in reversed(pair):
+            rows.append(
+                (
+                    f"r{i % RIDS}",
+                    f"Finished executing plug-in instance [{i}]: Plugin{i % PLUGIN_NAMES}, time: 1.5s.",
+                )
+            )
+    logs = DataFrame(rows, columns=["RId", "Message"])
+    logs["Thread"] = "main"
+    logs["Level"] = "INFO"
+    logs["Timestamp"] = "2025-11-24T05:00:00.000Z"
+    logs["Server"] = "PythonPlugin"
+    return logs
+
+
+def main():
+    baseline = None
+    print(f"{'plugin runs':>12} {'seconds':>10} {'us / run':>10} {'ratio':>7}")
+    for runs in SCALES:
+        parser = LogParser(build_logs(runs))
+        relevant = parser.filter_relevant_logs()
+        start = time.perf_counter()
+        sessions = parser.match_plugin_sessions(relevant)
+        elapsed = time.perf_counter() - start
+        assert len(sessions) == runs
+        per_run = elapsed / runs * 1e6
+        baseline = baseline or per_run
+        print(
+            f"{runs:>12,} {elapsed:>10.4f} {per_run:>10.2f} {per_run / baseline:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Wall time and peak RSS of the chunked log reader against the old
+``engine="python"`` reader.
+
+Run from the repository root:  python benchmarks/read_log.py [rows]
+Each reader runs in a fresh interpreter so peak RSS is not shared.
+"""
+
+import subprocess
+import sys
+import tempfile
+from os import path
+
+SRC = path.join(path.dirname(path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+READERS = {
+    "python engine": (
+        "from pandas import read_csv\n"
+        "read_csv(FILE, on_bad_lines='skip', engine='python', dtype=str)"
+    ),
+    "chunked": "from app.log_reader import read_log\nread_log(FILE)",
+}
+
+
+def write_log(file_path: str, rows: int):
+    """Write an export-shaped CSV with a few columns the parser never reads."""
+    with open(file_path, "w") as f:
+        f.write("Timestamp,Level,Logger,Server,RId,Thread,Tenant,Host,Message\n")
+        for i in range(rows):
+            f.write(
+                f"2025-11-24T05:{i // 60000 % 60:02d}:{i // 1000 % 60:02d}.{i % 1000:03d}Z,"
+                f"INFO,o9.plugins.Executor,PythonPlugin,r{i % 50},t{i % 8},"
+                f'tenant,host-{i % 4},"Starting user code execution, step {i}"\n'
+            )
+
+
+def measure(code: str, file_path: str) -> tuple:
+    script = (
+        f"import sys, time, resource\nsys.path.insert(0, {SRC!r})\n"
+        f"FILE = {file_path!r}\nstart = time.perf_counter()\n{code}\n"
+        "print(time.perf_counter() - start, "
+        "resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(out[0]), int(out[1]) / 1024
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = path.join(tmp, "log.csv")
+        write_log(file_path, rows)
+        print(f"{rows:,} rows, {path.getsize(file_path) / 2**20:.1f} MiB")
+        print(f"{'reader':>14} {'seconds':>9} {'peak RSS MiB':>13}")
+        for name, code in READERS.items():
+            seconds, rss = measure(code, file_path)
+            print(f"{name:>14} {seconds:>9.2f} {rss:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Synthetic o9-style logs for benchmarking LogParser.
+
+Logs are built from units of consecutive rows: a plugin run (start, phase
+markers, measures, end), two overlapping plugin runs of one RId with their
+lines interleaved, a query (Query Received / CPU TIME pair), a computation
+(counter line followed by its timing line), an error line or a noise line.
+Generation is vectorized so tens of millions of rows are cheap.
+
+    python benchmarks/synthetic.py 1000000 log.csv
+"""
+
+import sys
+
+import numpy as np
+from pandas import DataFrame, Series
+
+COLUMNS = ["Timestamp", "Level", "Server", "RId", "Thread", "Message"]
+
+PLUGIN, QUERY, COMPUTATION, ERROR, NOISE, OVERLAP = range(6)
+# Unit kind -> (rows per unit, share of units)
+UNITS = {
+    PLUGIN: (8, 0.08),
+    QUERY: (2, 0.25),
+    COMPUTATION: (2, 0.15),
+    ERROR: (1, 0.02),
+    NOISE: (1, 0.48),
+    OVERLAP: (16, 0.02),
+}
+SERVERS = {
+    PLUGIN: "PythonPlugin",
+    OVERLAP: "PythonPlugin",
+    QUERY: "QueryService",
+    COMPUTATION: "ComputeService",
+    ERROR: "PythonPlugin",
+    NOISE: "WebApi",
+}
+
+
+def _text(values) -> Series:
+    return Series(values).astype(str)
+
+
+def _plugin_messages(unit: Series, offset: np.ndarray, rng) -> Series:
+    name = "Plugin" + (unit % 97).astype(str)
+    instance = " [" + unit.astype(str) + "]: "
+    seconds = _text(rng.integers(1, 600_000, len(unit)) / 1000)
+    lines = [
+        "Started executing plug-in instance" + instance + name,
+        Series("Started executing the script on executor-1", index=unit.index),
+        Series("Starting user code execution", index=unit.index),
+        Series("Importing module : main", index=unit.index),
+        Series("Successfully executed user-defined function.", index=unit.index),
+        Series("Writing output data to files / tables", index=unit.index),
+        "Name of measures uploaded: Measure" + (unit % 13).astype(str) + ",Units",
+        "Finished executing plug-in instance"
+        + instance
+        + name
+        + ", time: "
+        + seconds
+        + "s.",
+    ]
+    out = Series("", index=unit.index, dtype=object)
+    for position, line in enumerate(lines):
+        mask = offset == position
+        out[mask] = line[mask]
+    return out
+
+
+def _overlapping_plugin_messages(unit: Series, offset: np.ndarray, rng) -> Series:
+    # Even rows belong to the first run, odd rows to the second, so each run
+    # starts before the other ends and both share the unit's RId
+    run = offset % 2
+    return _plugin_messages(unit * 2 + run, offset // 2, rng)
+
+
+def _query_messages(unit: Series, offset: np.ndarray, rng) -> Series:
+    query_id = "{" + unit.astype(str) + "}"
+    received = (
+        "Query Received: "
+        + query_id
+        + ": Select ([Version].[Version Name].[CurrentWorkingView] * [Item].[Item].["
+        + (unit % 5000).astype(str)
+        + "]) on row, ({Measure.[Sales]}) on column;"
+    )
+    finished = (
+        "CPU TIME: "
+        + query_id
+        + ": "
+        + _text(rng.integers(1, 900_000, len(unit)))
+        + " ms"
+    )
+    return received.where(offset == 0, finished)
+
+
+def _computation_messages(unit: Series, offset: np.ndarray, rng) -> Series:
+    count = _text(rng.integers(1, 10_000, len(unit)))
+    counters = (
+        "invocations: " + count + "; executions: " + count + "; non-null no ops: 0"
+    )
+    timing = (
+        "Finished computation ["
+        + unit.astype(str)
+        + "]. Query : Measure.[M"
+        + (unit % 50).astype(str)
+        + "] = Measure.[Sales] * 2; Computation execution time: "
+        + _text(np.round(rng.random(len(unit)) * 30, 3))
+        + " s"
+    )
+    return counters.where(offset == 0, timing)
+
+
+def _error_messages(unit: Series, offset: np.ndarray, rng) -> Series:
+    return "Script did not complete successfully for Plugin" + (unit % 97).astype(str)
+
+
+def _noise_messages(unit: Series, offset: np.ndarray, rng) -> Series:
+    return (
+        "Request handled for tenant in "
+        + _text(rng.integers(1, 500, len(unit)))
+        + " ms"
+    )
+
+
+MESSAGES = {
+    PLUGIN: _plugin_messages,
+    QUERY: _query_messages,
+    COMPUTATION: _computation_messages,
+    ERROR: _error_messages,
+    NOISE: _noise_messages,
+    OVERLAP: _overlapping_plugin_messages,
+}
+
+
+def generate_logs(
+    rows: int, seed: int = 0, rids: int = 200, shares: dict = None
+) -> DataFrame:
+    """
+    Return about ``rows`` string-typed log rows, as ``read_log`` would.
+
+    ``shares`` maps unit kinds to their share of units, replacing the
+    defaults in ``UNITS``; kinds left out are not generated.
+    """
+    rng = np.random.default_rng(seed)
+    if shares is None:
+        shares = {kind: share for kind, (_, share) in UNITS.items()}
+    kinds = np.array(list(UNITS))
+    lengths = np.array([UNITS[k][0] for k in kinds])
+    shares = np.array([shares.get(k, 0) for k in kinds], dtype=float)
+    shares /= shares.sum()
+    n_units = max(1, int(rows / (lengths * shares).sum()))
+
+    unit_kind = rng.choice(kinds, size=n_units, p=shares)
+    unit_length = lengths[unit_kind]
+    unit_start = np.cumsum(unit_length) - unit_length
+    row_unit = np.repeat(np.arange(n_units), unit_length)
+    row_offset = np.arange(len(row_unit)) - unit_start[row_unit]
+    row_kind = unit_kind[row_unit]
+    total = len(row_unit)
+
+    message = Series("", index=range(total), dtype=object)
+    for kind, build in MESSAGES.items():
+        mask = row_kind == kind
+        if mask.any():
+            units = Series(row_unit[mask])
+            message[mask] = build(units, row_offset[mask], rng).to_numpy()
+
+    timestamps = np.datetime64("2025-11-24T05:00:00.000") + np.arange(total) * 7
+    level = np.where(row_kind == ERROR, "ERROR", "INFO").astype(object)
+    level[(row_kind == NOISE) & (rng.random(total) < 0.05)] = "WARN"
+    rid = "rid-" + _text(rng.integers(0, rids, n_units)[row_unit])
+
+    return DataFrame(
+        {
+            "Timestamp": np.char.add(
+                np.datetime_as_string(timestamps.astype("datetime64[ms]")), "Z"
+            ).astype(object),
+            "Level": level,
+            "Server": Series(row_kind).map(SERVERS).to_numpy(),
+            "RId": rid.to_numpy(),
+            "Thread": ("thread-" + _text(row_unit % 16)).to_numpy(),
+            "Message": message.to_numpy(),
+        },
+        columns=COLUMNS,
+    )
+
+
+if __name__ == "__main__":
+    generate_logs(int(sys.argv[1])).to_csv(sys.argv[2], index=False)
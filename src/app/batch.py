@@ -0,0 +1,161 @@
+"""
+Analyze a directory of log exports without the Streamlit app.
+
+Every log under the directory, plain or gzip/zstd/zip compressed CSV, is
+parsed in its own worker process, and its plugin, query and computation
+summaries are written next to each other under the output directory,
+mirroring the input layout.
+
+    cd src && python -m app.batch /data/nightly --output /data/summaries
+    cd src && python -m app.batch /data/nightly --output out --format csv --workers 4
+
+Files that fail to parse are reported and skipped; the run exits non-zero
+when any did.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import as_completed
+from pathlib import Path
+
+from pandas import DataFrame
+
+from app.log_parser import LogParser
+from app.log_reader import LOG_SUFFIXES, read_log
+from app.parallel import DEFAULT_WORKERS, get_pool
+
+FORMATS: tuple = ("parquet", "csv")
+
+
+def find_logs(directory: Path, exclude: Path = None) -> list[Path]:
+    """
+    Log files anywhere under ``directory``, in a stable order.
+
+    Files under ``exclude`` are left out, so summaries written inside the
+    input directory are not read back as logs by the next run.
+    """
+    excluded = None if exclude is None else exclude.resolve()
+    return sorted(
+        path
+        for path in directory.rglob("*")
+        if path.is_file()
+        and path.name.lower().endswith(LOG_SUFFIXES)
+        and (excluded is None or not path.resolve().is_relative_to(excluded))
+    )
+
+
+def strip_log_suffix(path: Path) -> Path:
+    """``nightly/a.csv.gz`` becomes ``nightly/a``."""
+    name = path.name.lower()
+    suffix = next(suffix for suffix in LOG_SUFFIXES if name.endswith(suffix))
+    return path.with_name(path.name[: -len(suffix)])
+
+
+def write_table(table: DataFrame, path: Path, file_format: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if file_format == "parquet":
+        table.to_parquet(path, index=False)
+    else:
+        table.to_csv(path, index=False)
+
+
+def analyze_file(source: Path, target: Path, file_format: str, is_warn: bool) -> dict:
+    """
+    Parse one log and write its summaries as ``target/<analysis>.<file_format>``.
+
+    Runs in a worker process, so only paths and counts cross the pool.
+    """
+    start = time.perf_counter()
+    with open(source, "rb") as f:
+        parser = LogParser(read_log(f), is_warn)
+    summaries = {
+        "plugins": parser.parse_plugin_summary().reset_index(),
+        "queries": parser.parse_queries().reset_index(drop=True),
+        "computations": parser.parse_computations().reset_index(drop=True),
+    }
+    for name, table in summaries.items():
+        write_table(table, target / f"{name}.{file_format}", file_format)
+    return {
+        "File": str(source),
+        "Rows": len(parser.logs),
+        **{name.title(): len(table) for name, table in summaries.items()},
+        "Seconds": time.perf_counter() - start,
+    }
+
+
+def run(
+    directory: Path,
+    output: Path,
+    file_format: str = "parquet",
+    workers: int = DEFAULT_WORKERS,
+    is_warn: bool = False,
+) -> tuple[DataFrame, list]:
+    """
+    Analyze every log under ``directory``, ``workers`` files at a time.
+
+    Returns the per-file results and ``(file, error)`` pairs of failures.
+    """
+    jobs = {
+        source: output / strip_log_suffix(source.relative_to(directory))
+        for source in find_logs(directory, exclude=output)
+    }
+    results, failures = [], []
+    if workers > 1 and len(jobs) > 1:
+        pool = get_pool(workers)
+        futures = {
+            pool.submit(analyze_file, source, target, file_format, is_warn): source
+            for source, target in jobs.items()
+        }
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                failures.append((str(futures[future]), repr(e)))
+    else:
+        for source, target in jobs.items():
+            try:
+                results.append(analyze_file(source, target, file_format, is_warn))
+            except Exception as e:
+                failures.append((str(source), repr(e)))
+    columns = ["File", "Rows", "Plugins", "Queries", "Computations", "Seconds"]
+    summary = DataFrame(results, columns=columns).sort_values("File")
+    return summary.reset_index(drop=True), failures
+
+
+def main(argv: list = None):
+    arguments = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    arguments.add_argument("directory", type=Path)
+    arguments.add_argument("--output", type=Path, required=True)
+    arguments.add_argument("--format", choices=FORMATS, default="parquet")
+    arguments.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, help="files parsed at once"
+    )
+    arguments.add_argument(
+        "--warn", action="store_true", help="include WARN lines in plugin logs"
+    )
+    options = arguments.parse_args(argv)
+
+    start = time.perf_counter()
+    summary, failures = run(
+        options.directory,
+        options.output,
+        options.format,
+        options.workers,
+        options.warn,
+    )
+    elapsed = time.perf_counter() - start
+    write_table(summary, options.output / f"summary.{options.format}", options.format)
+
+    for source, error in failures:
+        print(f"FAILED {source}: {error}", file=sys.stderr)
+    rows = int(summary["Rows"].sum())
+    print(
+        f"{len(summary)} files, {rows:,} rows in {elapsed:.2f}s: "
+        f"{len(summary) / elapsed:.2f} files/s, {rows / elapsed:,.0f} rows/s"
+    )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from math import erfc, sqrt
+
+import numpy as np
+from pandas import DataFrame, Series, concat, factorize
+
+from app.profiler import profiled
+
+# A regression needs a one-sided p-value below ALPHA and the median time
+# to grow by at least MIN_SLOWDOWN.
+ALPHA: float = 0.05
+MIN_SLOWDOWN: float = 1.1
+
+RUNS_BEFORE: str = "Runs Before"
+RUNS_AFTER: str = "Runs After"
+MEDIAN_BEFORE: str = "Median Before (Seconds)"
+MEDIAN_AFTER: str = "Median After (Seconds)"
+CHANGE: str = "Change (%)"
+P_VALUE: str = "p-value"
+REGRESSION: str = "Regression"
+
+
+@profiled
+def compare_times(before: Series, after: Series) -> DataFrame:
+    """
+    Per-key run counts, median times and slowdown test of two logs.
+
+    ``before`` and ``after`` hold seconds indexed by key (plugin name,
+    fingerprint). Keys of both logs are factorized in one hash pass and
+    every statistic is a bincount or groupby over the shared codes, so the
+    logs are never joined row by row. The one-sided Mann-Whitney U test,
+    with the normal approximation and tie correction, asks whether times
+    after are larger than before.
+    """
+    combined = concat([before, after], keys=[0, 1], names=["Side", "Key"])
+    combined = combined.dropna().reset_index()
+    codes, keys = factorize(combined["Key"])
+    after_rows = combined["Side"].to_numpy() == 1
+    seconds = combined.iloc[:, -1].astype(float)
+    n = len(keys)
+
+    n1 = np.bincount(codes[~after_rows], minlength=n).astype(float)
+    n2 = np.bincount(codes[after_rows], minlength=n).astype(float)
+    ranks = seconds.groupby(codes).rank().to_numpy()
+    # Without weights left after dropna, bincount returns integers
+    u = np.bincount(codes[after_rows], weights=ranks[after_rows], minlength=n)
+    u = u.astype(float) - n2 * (n2 + 1) / 2
+    ties = seconds.groupby([codes, seconds.to_numpy()]).size()
+    tied = ties.to_numpy().astype(float)
+    tie_term = np.bincount(
+        ties.index.get_level_values(0), weights=tied**3 - tied, minlength=n
+    )
+    total = n1 + n2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = n1 * n2 / 12 * (total + 1 - tie_term / (total * (total - 1)))
+        # Continuity-corrected; NaN where either log has no runs or no spread
+        z = (u - n1 * n2 / 2 - 0.5) / np.sqrt(np.where(variance > 0, variance, np.nan))
+    p_values = np.array([np.nan if np.isnan(v) else erfc(v / sqrt(2)) / 2 for v in z])
+
+    medians = seconds.groupby([codes, after_rows]).median().unstack()
+    medians = medians.reindex(index=range(n), columns=[False, True])
+    result = DataFrame(
+        {
+            RUNS_BEFORE: n1.astype(int),
+            RUNS_AFTER: n2.astype(int),
+            MEDIAN_BEFORE: medians[False].to_numpy(),
+            MEDIAN_AFTER: medians[True].to_numpy(),
+            P_VALUE: p_values,
+        },
+        index=keys,
+    )
+    ratio = result[MEDIAN_AFTER] / result[MEDIAN_BEFORE]
+    result.insert(4, CHANGE, ((ratio - 1) * 100).round(1))
+    result[REGRESSION] = (result[P_VALUE] < ALPHA) & (ratio >= MIN_SLOWDOWN)
+    return result.sort_values(by=[REGRESSION, CHANGE], ascending=False)
+
+
+def compare_plugins(parser, before: DataFrame, after: DataFrame) -> DataFrame:
+    """Plugin summaries of two logs compared by plugin name."""
+    comparison = compare_times(
+        *(
+            results.set_index(parser.plugin_name)[parser.time_taken]
+            for results in (before, after)
+        )
+    )
+    comparison.index.name = parser.plugin_name
+    return comparison
+
+
+def compare_fingerprints(parser, before: DataFrame, after: DataFrame) -> DataFrame:
+    """Queries or computations of two logs compared by text fingerprint."""
+    times, patterns = [], []
+    for results in (before, after):
+        fingerprints = parser.fingerprint_queries(results[parser.MESSAGE])
+        keys = fingerprints[parser.fingerprint].to_numpy()
+        times.append(Series(results[parser.time_taken].to_numpy(), index=keys))
+        patterns.append(
+            Series(fingerprints[parser.query_pattern].to_numpy(), index=keys)
+        )
+    comparison = compare_times(*times)
+    patterns = concat(patterns)
+    patterns = patterns[~patterns.index.duplicated()]
+    comparison.insert(0, parser.query_pattern, patterns.reindex(comparison.index))
+    comparison.index = comparison.index.map("{:016x}".format)
+    comparison.index.name = parser.fingerprint
+    return comparison
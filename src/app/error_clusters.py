@@ -0,0 +1,188 @@
+import re
+from collections import OrderedDict
+
+from pandas import DataFrame, isna
+
+from app.profiler import profiled
+
+WILDCARD: str = "<*>"
+# Variable parts replaced by WILDCARD before a message is split into tokens:
+# quoted strings, UUIDs, hex literals and numbers.
+MASKS: list = [
+    re.compile(r"'[^']*'|\"[^\"]*\""),
+    re.compile(r"\b[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}\b"),
+    re.compile(r"\b0x[0-9a-fA-F]+\b"),
+    re.compile(r"(?<![A-Za-z_])[-+]?\d+(?:\.\d+)?"),
+]
+# Leading tokens that route a message down the tree, after its token count.
+ROUTING_TOKENS: int = 2
+# Share of equal tokens a message needs to join a cluster's template.
+SIMILARITY: float = 0.4
+# Bounds that keep the miner's memory independent of the log size.
+MAX_CHILDREN: int = 100
+MAX_CLUSTERS: int = 1_000
+MAX_PLUGINS: int = 20
+MAX_CACHED_MESSAGES: int = 10_000
+
+TEMPLATE: str = "Template"
+COUNT: str = "Count"
+FIRST_SEEN: str = "First Seen"
+LAST_SEEN: str = "Last Seen"
+PLUGINS: str = "Plugins"
+
+
+def mask(message: str) -> list:
+    """Tokens of ``message`` with its variable parts replaced by WILDCARD."""
+    for pattern in MASKS:
+        message = pattern.sub(WILDCARD, message)
+    return message.split() or [WILDCARD]
+
+
+class _Cluster:
+    __slots__ = ("tokens", "leaf", "count", "first", "last", "plugins", "more")
+
+    def __init__(self, tokens: list, leaf: list):
+        self.tokens: list = tokens
+        # The leaf of the tree holding this cluster's id
+        self.leaf: list = leaf
+        self.count: int = 0
+        self.first = None
+        self.last = None
+        self.plugins: set = set()
+        # Whether plugins beyond MAX_PLUGINS were seen
+        self.more: bool = False
+
+
+class TemplateMiner:
+    """
+    Drain-style log template miner with per-template statistics.
+
+    Messages are masked, split on whitespace and routed down a fixed-depth
+    tree by token count and their first ``ROUTING_TOKENS`` tokens. In the
+    leaf a message joins the cluster sharing the most tokens with it, if
+    at least ``SIMILARITY`` of them, and positions that differ become
+    WILDCARD; otherwise it starts a cluster of its own.
+
+    One pass is enough, and memory stays bounded however long the log:
+    tokens with digits and tokens past ``MAX_CHILDREN`` children share a
+    WILDCARD child, and past ``max_clusters`` the least recently matched
+    cluster is dropped along with its statistics.
+    """
+
+    def __init__(self, max_clusters: int = MAX_CLUSTERS):
+        self.max_clusters: int = max_clusters
+        self._tree: dict = {}
+        self._clusters: OrderedDict = OrderedDict()
+        self._next_id: int = 0
+        # Templates only ever generalize, so a message seen before still
+        # matches its cluster and can skip the tree
+        self._cache: dict = {}
+
+    def _leaf(self, tokens: list) -> list:
+        path = [len(tokens)] + [
+            WILDCARD if any(char.isdigit() for char in token) else token
+            for token in tokens[:ROUTING_TOKENS]
+        ]
+        node = self._tree
+        for depth, step in enumerate(path):
+            if step not in node and len(node) >= MAX_CHILDREN:
+                step = WILDCARD
+            node = node.setdefault(step, [] if depth == len(path) - 1 else {})
+        return node
+
+    def _closest(self, leaf: list, tokens: list):
+        best, best_score = None, (SIMILARITY, -1)
+        for cluster_id in leaf:
+            template = self._clusters[cluster_id].tokens
+            equal = sum(old == new for old, new in zip(template, tokens))
+            # Ties go to the more general template
+            score = (equal / len(tokens), template.count(WILDCARD))
+            if score >= best_score:
+                best, best_score = cluster_id, score
+        return best
+
+    def match(self, message: str) -> int:
+        """Id of the cluster ``message`` belongs to, updating the templates."""
+        cluster_id = self._cache.get(message)
+        if cluster_id in self._clusters:
+            self._clusters.move_to_end(cluster_id)
+            return cluster_id
+
+        tokens = mask(message)
+        leaf = self._leaf(tokens)
+        cluster_id = self._closest(leaf, tokens)
+        if cluster_id is None:
+            cluster_id = self._next_id
+            self._next_id += 1
+            self._clusters[cluster_id] = _Cluster(tokens, leaf)
+            leaf.append(cluster_id)
+            if len(self._clusters) > self.max_clusters:
+                evicted_id, evicted = self._clusters.popitem(last=False)
+                evicted.leaf.remove(evicted_id)
+        else:
+            cluster = self._clusters[cluster_id]
+            cluster.tokens = [
+                old if old == new else WILDCARD
+                for old, new in zip(cluster.tokens, tokens)
+            ]
+            self._clusters.move_to_end(cluster_id)
+
+        if len(self._cache) >= MAX_CACHED_MESSAGES:
+            self._cache.clear()
+        self._cache[message] = cluster_id
+        return cluster_id
+
+    def add(self, message: str, timestamp=None, plugin=None) -> int:
+        """Count one occurrence of ``message``; returns its cluster id."""
+        cluster_id = self.match(message)
+        cluster = self._clusters[cluster_id]
+        cluster.count += 1
+        if not isna(timestamp):
+            if cluster.first is None or timestamp < cluster.first:
+                cluster.first = timestamp
+            if cluster.last is None or timestamp > cluster.last:
+                cluster.last = timestamp
+        if not isna(plugin) and plugin not in cluster.plugins:
+            if len(cluster.plugins) < MAX_PLUGINS:
+                cluster.plugins.add(plugin)
+            else:
+                cluster.more = True
+        return cluster_id
+
+    def clusters(self) -> DataFrame:
+        """One row per cluster, most frequent first."""
+        rows = [
+            (
+                " ".join(cluster.tokens),
+                cluster.count,
+                cluster.first,
+                cluster.last,
+                ", ".join(sorted(map(str, cluster.plugins)) + ["…"] * cluster.more),
+            )
+            for cluster in self._clusters.values()
+        ]
+        return DataFrame(
+            rows, columns=[TEMPLATE, COUNT, FIRST_SEEN, LAST_SEEN, PLUGINS]
+        ).sort_values(by=[COUNT], ascending=False, kind="stable", ignore_index=True)
+
+
+@profiled
+def cluster_errors(parser, sessions) -> DataFrame:
+    """
+    Templates of the log's ERROR lines, with counts, first and last time
+    and the plugins they were logged in.
+
+    ``sessions`` is the ``parser.parse_plugin_sessions`` result.
+    """
+    logs = parser.logs
+    errors = logs[logs[parser.LEVEL] == parser.ERROR]
+    owners = parser.row_plugins(sessions).reindex(errors.index)
+    miner = TemplateMiner()
+    for message, timestamp, plugin in zip(
+        errors[parser.MESSAGE].to_numpy(),
+        errors[parser.TIMESTAMP].to_numpy(),
+        owners.to_numpy(),
+    ):
+        if not isna(message):
+            miner.add(str(message), timestamp, plugin)
+    return miner.clusters()
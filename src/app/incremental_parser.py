@@ -0,0 +1,233 @@
+from bisect import bisect_left
+
+import numpy as np
+from pandas import DataFrame, RangeIndex, concat
+from pandas.api.types import CategoricalDtype, union_categoricals
+
+from app.log_parser import (
+    KIND_COMPUTATION,
+    KIND_COMPUTATION_COUNTERS,
+    KIND_PLUGIN_END,
+    KIND_PLUGIN_START,
+    LogParser,
+    PluginSessions,
+)
+from app.log_reader import LOG_COLUMNS
+from app.profiler import profiled
+from app.sketch import QuantileSketch
+
+
+def concat_logs(*frames: DataFrame) -> DataFrame:
+    """Stack typed log tables, merging the categories of their categoricals."""
+    first = frames[0]
+    columns = {}
+    for column in first.columns:
+        values = [frame[column] for frame in frames]
+        if isinstance(first[column].dtype, CategoricalDtype):
+            columns[column] = union_categoricals(values, sort_categories=True)
+        else:
+            columns[column] = concat(values, ignore_index=True)
+    index = first.index.append([frame.index for frame in frames[1:]])
+    return DataFrame(columns).set_axis(index)
+
+
+class LogChunks:
+    """
+    An append-only log table held as the frames appended to it.
+
+    Rows are labelled by increasing row numbers. ``append`` only records a
+    frame, so it costs nothing per row already held. Reads stack the frames
+    they need with ``concat_logs`` and keep the stacked frame in their
+    place for the next read. Empty frames are kept too, since their
+    categories are part of the table's.
+    """
+
+    def __init__(self, frame: DataFrame):
+        self._frames: list = []
+        # Rows before each frame and the last row label up to each frame
+        self._starts: list = []
+        self._last_labels: list = []
+        self._rows: int = 0
+        self.append(frame)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def append(self, frame: DataFrame):
+        """Add rows labelled after the current ones."""
+        last_label = self._last_labels[-1] if self._last_labels else -1
+        self._frames.append(frame)
+        self._starts.append(self._rows)
+        self._last_labels.append(frame.index[-1] if len(frame) else last_label)
+        self._rows += len(frame)
+
+    def _stack_from(self, first: int) -> DataFrame:
+        """Frames ``first`` onwards as one frame, which replaces them."""
+        if len(self._frames) - first > 1:
+            self._frames[first:] = [concat_logs(*self._frames[first:])]
+            del self._starts[first + 1 :]
+            self._last_labels[first:] = [self._last_labels[-1]]
+        return self._frames[first]
+
+    def frame(self) -> DataFrame:
+        """The whole table."""
+        return self._stack_from(0)
+
+    def tail(self, label) -> tuple:
+        """
+        Rows labelled ``label`` or later, with the position of the first.
+
+        Only the frames holding such rows are stacked.
+        """
+        first = min(bisect_left(self._last_labels, label), len(self._frames) - 1)
+        start = self._starts[first]
+        frame = self._stack_from(first)
+        skip = int(frame.index.searchsorted(label))
+        return start + skip, frame.iloc[skip:]
+
+
+class IncrementalLogParser(LogParser):
+    """
+    LogParser for a growing log that is fed in appended row batches.
+
+    Plugin runs without an end, queries waiting for their ``CPU TIME`` line,
+    the last counter line of every thread and finished results are kept
+    between batches, so ``append`` classifies, filters and matches only the
+    new rows. The log and result tables are kept as the pieces each batch
+    added and stacked when read. Results equal those of parsing all rows
+    at once.
+    """
+
+    @profiled
+    def __init__(self, logs=None, is_warn: bool = False, workers: int = 1):
+        empty = DataFrame(columns=LOG_COLUMNS) if logs is None else logs.iloc[:0]
+        super().__init__(empty, is_warn, workers)
+        self.logs = self.logs.set_axis(RangeIndex(0))
+        # Plugin sessions as in pair_plugin_events, and their summary rows
+        # per batch; a later batch re-summarizes the sessions it finishes
+        self._sessions: list = []
+        self._open_starts: dict = {}
+        self._plugin_summaries: list = [
+            self.summarize_plugin_sessions(self.logs, [], *self.tag_plugin_sessions({}))
+        ]
+        self._relevant_logs = LogChunks(self.logs)
+        self._session_rows = {}
+        # In-flight queries of pair_queries, and the completed ones
+        self._pending_queries: dict = {}
+        self._early_query_ends: dict = {}
+        self._queries: list = []
+        # Computations per batch, and the last counter line of each thread
+        # whose computation has not been seen yet
+        self._computations: list = [self.summarize_computations(self.logs)]
+        self._counter_lines: DataFrame = self.logs
+        # Times of finished results, which later batches never change
+        self._sketches: dict = {
+            analysis: QuantileSketch()
+            for analysis in ("plugins", "queries", "computations")
+        }
+        if logs is not None and len(logs):
+            self.append(logs)
+
+    @property
+    def logs(self) -> DataFrame:
+        return self._logs.frame()
+
+    @logs.setter
+    def logs(self, logs: DataFrame):
+        self._logs = LogChunks(logs)
+
+    @profiled
+    def append(self, logs):
+        """Add rows logged after the current ones and update every result."""
+        batch = self.prepare_logs(logs)
+        start = len(self._logs)
+        batch.index = RangeIndex(start, start + len(batch))
+        self._logs.append(batch)
+
+        self._append_plugins(self.filter_relevant_logs(batch))
+        queries = self.pair_queries(
+            batch, self._pending_queries, self._early_query_ends
+        )
+        self._queries += queries
+        # Rounded as in query_table
+        self._sketches["queries"].add(
+            np.array([seconds for _, _, seconds in queries], dtype=float).round(4)
+        )
+        self._append_computations(batch)
+
+    def _append_plugins(self, relevant: DataFrame):
+        """Match the plugin events of new relevant rows and summarize them."""
+        self._relevant_logs.append(relevant)
+        known = len(self._sessions)
+        finished = self.pair_plugin_events(
+            relevant[relevant[self.KIND] == KIND_PLUGIN_START],
+            relevant[relevant[self.KIND] == KIND_PLUGIN_END],
+            self._sessions,
+            self._open_starts,
+        )
+        touched = sorted(set(finished).union(range(known, len(self._sessions))))
+        if not touched:
+            return
+
+        # Only rows from the earliest touched start onwards can belong to them
+        first_start = min(self._sessions[session][2] for session in touched)
+        begin, window = self._relevant_logs.tail(first_start)
+        session_rows = self.plugin_session_rows(
+            window, self._sessions, touched, offset=begin
+        )
+        session_ids, positions = self.tag_plugin_sessions(session_rows)
+        summary = self.summarize_plugin_sessions(
+            window, self._sessions, session_ids, positions - begin, ids=touched
+        )
+        self._session_rows.update(session_rows)
+        self._sketches["plugins"].add(summary[self.time_taken].reindex(finished))
+        self._plugin_summaries.append(summary)
+
+    def _append_computations(self, batch: DataFrame):
+        """Summarize new computations against the carried counter lines."""
+        logs = concat_logs(self._counter_lines, batch)
+        kinds = logs[self.KIND].to_numpy()
+        computations = self.summarize_computations(
+            logs[kinds == KIND_COMPUTATION], logs
+        )
+        self._computations.append(computations)
+        self._sketches["computations"].add(computations[self.time_taken])
+
+        events = logs[
+            (kinds == KIND_COMPUTATION) | (kinds == KIND_COMPUTATION_COUNTERS)
+        ]
+        latest = events[~events[self.THREAD].cat.codes.duplicated(keep="last")]
+        self._counter_lines = latest[latest[self.KIND] == KIND_COMPUTATION_COUNTERS]
+
+    @staticmethod
+    def _stack(frames: list, **options) -> DataFrame:
+        """Concatenate result pieces in place; empty pieces only keep columns."""
+        if len(frames) > 1:
+            pieces = [frame for frame in frames if len(frame)] or frames[:1]
+            frames[:] = [concat(pieces, **options)]
+        return frames[0]
+
+    def parse_plugin_sessions(self) -> PluginSessions:
+        summary = self._stack(self._plugin_summaries)
+        if not summary.index.is_unique:
+            summary = summary[~summary.index.duplicated(keep="last")].sort_index()
+            self._plugin_summaries[:] = [summary]
+        summary.index.name = self.session_id
+        # A copy of the rows, which later batches extend
+        return PluginSessions(
+            summary, self._relevant_logs.frame(), dict(self._session_rows)
+        )
+
+    def parse_queries(self):
+        queries = self.query_table(
+            self._queries + self.unfinished_queries(self._pending_queries)
+        )
+        return queries.sort_values(by=[self.time_taken], ascending=False)
+
+    def parse_computations(self):
+        computations = self._stack(self._computations, ignore_index=True)
+        return computations.sort_values(by=[self.time_taken], ascending=False)
+
+    def time_sketch(self, analysis: str, results: DataFrame = None) -> QuantileSketch:
+        """Sketch kept up to date by ``append``; ``results`` is not needed."""
+        return QuantileSketch().merge(self._sketches[analysis])
@@ -0,0 +1,149 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+from pandas import DataFrame, Index, Series
+from pandas.api.types import CategoricalDtype
+
+from app.profiler import profiled
+
+# Shared by every session of the app process.
+MAX_CACHE_BYTES: int = 2 * 1024**3
+HASH_BLOCK_SIZE: int = 8 * 1024**2
+# Python objects measured per object column when estimating its size
+SIZE_SAMPLE: int = 1000
+
+
+@profiled
+def content_hash(_file) -> str:
+    """Hash the bytes of an uploaded file, leaving its read position alone."""
+    digest = hashlib.blake2b(digest_size=16)
+    position = _file.tell()
+    _file.seek(0)
+    for block in iter(lambda: _file.read(HASH_BLOCK_SIZE), b""):
+        digest.update(block)
+    _file.seek(position)
+    return digest.hexdigest()
+
+
+def values_size(values: Series | Index) -> int:
+    """
+    Approximate bytes of a column or index without visiting every row.
+
+    Numeric and Arrow-backed values report their buffers, categoricals their
+    codes plus their categories, and object values their pointers plus the
+    average size of an evenly spaced sample of the objects.
+    """
+    dtype = values.dtype
+    if isinstance(dtype, CategoricalDtype):
+        return values.array.codes.nbytes + values_size(dtype.categories)
+    if dtype != object:
+        return int(values.nbytes)
+    objects = values.to_numpy()
+    sample = objects[:: max(1, len(objects) // SIZE_SAMPLE)]
+    if not len(sample):
+        return objects.nbytes
+    sampled = sum(map(sys.getsizeof, sample))
+    return objects.nbytes + sampled * len(objects) // len(sample)
+
+
+def estimate_size(value, _seen: set = None) -> int:
+    """Approximate bytes held by a parse result and everything it references."""
+    _seen = set() if _seen is None else _seen
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    if isinstance(value, DataFrame):
+        return values_size(value.index) + sum(
+            values_size(column) for _, column in value.items()
+        )
+    if isinstance(value, Series):
+        return values_size(value.index) + values_size(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(v, _seen) for v in value)
+    if hasattr(value, "nbytes"):
+        # Arrays, and objects such as a MessageIndex that size themselves
+        return int(value.nbytes)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + estimate_size(vars(value), _seen)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by the estimated size of its values."""
+
+    def __init__(self, max_bytes: int = MAX_CACHE_BYTES):
+        self.max_bytes: int = max_bytes
+        self.current_bytes: int = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # Lock of each key being computed and the callers holding or awaiting it
+        self._computing: dict = {}
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, default=None):
+        """Return a cached value and mark it most recently used."""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value, size: int = None):
+        """Store a value, evicting least recently used entries to fit it."""
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                # Too large to ever fit; callers still get the computed value
+                return value
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                self.current_bytes -= self._entries.popitem(last=False)[1][1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for ``key``, computing and storing it once.
+
+        Callers asking for a key that is being computed wait for that result
+        instead of computing it again; other keys are not held up.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        with self._lock:
+            computing = self._computing.setdefault(key, [threading.Lock(), 0])
+            computing[1] += 1
+        try:
+            with computing[0]:
+                value = self.get(key, missing)
+                if value is missing:
+                    value = self.put(key, compute())
+        finally:
+            with self._lock:
+                computing[1] -= 1
+                if not computing[1]:
+                    del self._computing[key]
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
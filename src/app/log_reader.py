@@ -0,0 +1,106 @@
+import gzip
+import zipfile
+
+import pyarrow as pa
+from pandas import DataFrame, concat, read_csv
+from pandas.errors import ParserError
+
+from app.profiler import profiled
+
+# Columns LogParser projects an uploaded log down to.
+LOG_COLUMNS: list = ["RId", "Thread", "Level", "Timestamp", "Server", "Message"]
+CHUNK_SIZE: int = 200_000
+# File name endings of logs open_log can read, and the upload types they allow.
+LOG_SUFFIXES: tuple = (".csv", ".csv.gz", ".csv.zst", ".zip")
+UPLOAD_TYPES: list = ["csv", "gz", "zst", "zip"]
+# Leading bytes of the compressed formats open_log unpacks.
+GZIP_MAGIC: bytes = b"\x1f\x8b"
+ZSTD_MAGIC: bytes = b"\x28\xb5\x2f\xfd"
+ZIP_MAGIC: bytes = b"PK\x03\x04"
+
+
+def _project(chunk: DataFrame, columns: list) -> DataFrame:
+    return chunk[[column for column in chunk.columns if column in columns]]
+
+
+def open_log(_file):
+    """
+    Return a binary stream of the CSV text of a plain or compressed log.
+
+    gzip, zstd and zip files are recognised by their leading bytes and
+    decompressed as the reader pulls from the stream, so no decompressed
+    copy is written or held whole. Of a zip archive the first CSV member
+    is read, and an archive without one raises ValueError. Text streams are
+    returned as they are.
+    """
+    start = _file.tell()
+    magic = _file.read(4)
+    _file.seek(start)
+    if not isinstance(magic, bytes):
+        return _file
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=_file, mode="rb")
+    if magic.startswith(ZSTD_MAGIC):
+        return pa.CompressedInputStream(pa.PythonFile(_file, mode="r"), "zstd")
+    if magic.startswith(ZIP_MAGIC):
+        # A member opened before the archive closes stays readable, and the
+        # archive's hold on the upload ends when the member is closed
+        with zipfile.ZipFile(_file) as archive:
+            csvs = [
+                member
+                for member in archive.infolist()
+                if not member.is_dir() and member.filename.lower().endswith(".csv")
+            ]
+            if not csvs:
+                raise ValueError("The zip archive contains no CSV file.")
+            return archive.open(csvs[0])
+    return _file
+
+
+def iter_log_chunks(
+    _file, columns: list = None, chunksize: int = CHUNK_SIZE, engine: str = "c"
+):
+    """
+    Yield the log in projected, string-typed chunks.
+
+    Uses the C parser by default and keeps only the analysed columns of each
+    chunk, so at most one chunk of unused columns is alive at a time.
+    Projection happens after parsing rather than through ``usecols`` because
+    the C parser stops rejecting rows with extra fields once ``usecols`` is
+    set. Malformed lines are skipped like the previous reader did.
+    Compressed files are decompressed on the fly by ``open_log``.
+    """
+    columns = columns or LOG_COLUMNS
+    stream = open_log(_file) if hasattr(_file, "tell") else _file
+    try:
+        with read_csv(
+            stream, engine=engine, dtype=str, on_bad_lines="skip", chunksize=chunksize
+        ) as reader:
+            for chunk in reader:
+                yield _project(chunk, columns)
+    finally:
+        # Closing an Arrow stream would close the upload under it as well
+        if stream is not _file and not isinstance(stream, pa.NativeFile):
+            stream.close()
+
+
+@profiled
+def read_log(_file, columns: list = None, chunksize: int = CHUNK_SIZE) -> DataFrame:
+    """
+    Read a whole log through the chunked reader.
+
+    Files the C tokenizer rejects are read again from the start with the
+    python engine. Chunks the C parser produced before failing are
+    discarded, since the two engines may split and skip rows differently.
+    """
+    start = _file.tell() if hasattr(_file, "tell") else None
+    try:
+        chunks = list(iter_log_chunks(_file, columns, chunksize))
+    except ParserError:
+        if start is None:
+            raise
+        _file.seek(start)
+        chunks = list(iter_log_chunks(_file, columns, chunksize, engine="python"))
+    if not chunks:
+        return DataFrame(columns=columns or LOG_COLUMNS, dtype=str)
+    return concat(chunks, ignore_index=True)
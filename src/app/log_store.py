@@ -0,0 +1,112 @@
+import os
+import tempfile
+from os import path
+
+import pyarrow as pa
+from pyarrow import feather
+from pandas import DataFrame, StringDtype
+
+from app.log_parser import LogParser
+from app.parallel import MIN_PARALLEL_ROWS, SERVER_WORKERS
+from app.profiler import profiled
+from app.log_reader import read_log
+
+# Bump when LogParser changes how it types or classifies the log table.
+STORE_VERSION: int = 4
+STORE_DIR: str = path.join(tempfile.gettempdir(), "logs-analyzer")
+MAX_STORE_BYTES: int = 20 * 1024**3
+# Arrow text types loaded as pandas strings backed by the Arrow buffers.
+ARROW_STRINGS: dict = {
+    pa.string(): StringDtype("pyarrow"),
+    pa.large_string(): StringDtype("pyarrow"),
+}
+
+
+def store_path(file_hash: str) -> str:
+    return path.join(STORE_DIR, f"{file_hash}.v{STORE_VERSION}.arrow")
+
+
+@profiled
+def save_log_table(file_hash: str, logs: DataFrame) -> str:
+    """
+    Write a parsed log table as an uncompressed Arrow IPC file.
+
+    Uncompressed files can be memory-mapped on load. Text columns are
+    stored as ``large_string``, the type pandas' Arrow strings use, so they
+    load without a cast. The file is written next to its final name and
+    renamed, so readers never see a partial file.
+    """
+    os.makedirs(STORE_DIR, exist_ok=True)
+    target = store_path(file_hash)
+    fd, partial = tempfile.mkstemp(dir=STORE_DIR, suffix=".partial")
+    os.close(fd)
+    try:
+        table = pa.Table.from_pandas(logs, preserve_index=True)
+        for position, field in enumerate(table.schema):
+            if field.type == pa.string():
+                table = table.set_column(
+                    position,
+                    field.with_type(pa.large_string()),
+                    table.column(position).cast(pa.large_string()),
+                )
+        feather.write_feather(table, partial, compression="uncompressed")
+        os.replace(partial, target)
+    finally:
+        if path.exists(partial):
+            os.remove(partial)
+    prune_store(keep=target)
+    return target
+
+
+@profiled
+def load_log_table(file_hash: str) -> DataFrame | None:
+    """
+    Memory-map a saved log table, or return None when there is none.
+
+    Text columns stay Arrow-backed ``string[pyarrow]`` columns that read
+    from the mapped file, so messages are not copied into Python strings.
+    Categorical codes, timestamps and kinds are copied out.
+    """
+    target = store_path(file_hash)
+    if not path.exists(target):
+        return None
+    try:
+        table = feather.read_table(target, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        os.remove(target)
+        return None
+    os.utime(target)
+    return table.to_pandas(types_mapper=ARROW_STRINGS.get)
+
+
+def prune_store(max_bytes: int = MAX_STORE_BYTES, keep: str = None):
+    """
+    Delete the least recently used tables until the store fits, never the
+    table at ``keep``, the one just written.
+    """
+    if not path.isdir(STORE_DIR):
+        return
+    files = [
+        path.join(STORE_DIR, name)
+        for name in os.listdir(STORE_DIR)
+        if name.endswith(".arrow")
+    ]
+    files.sort(key=path.getmtime, reverse=True)
+    total = 0
+    for file in files:
+        total += path.getsize(file)
+        if total > max_bytes and file != keep:
+            os.remove(file)
+
+
+@profiled
+def load_parser(_file, file_hash: str, is_warn: bool = False) -> LogParser:
+    """Build a LogParser for an upload, reusing its saved table when present."""
+    logs = load_log_table(file_hash)
+    if logs is not None:
+        return LogParser(logs, is_warn)
+    logs = read_log(_file)
+    workers = SERVER_WORKERS if len(logs) >= MIN_PARALLEL_ROWS else 1
+    parser = LogParser(logs, is_warn, workers=workers)
+    save_log_table(file_hash, parser.logs)
+    return parser
@@ -0,0 +1,81 @@
+import numpy as np
+from pandas import CategoricalDtype, DataFrame
+from pandas.api.types import is_object_dtype, is_string_dtype
+
+# Rows sent to the browser per page of a table.
+PAGE_SIZE: int = 100
+# Text colour of log lines by level.
+LEVEL_STYLES: dict = {
+    "ERROR": "color: #C30B0B",
+    "WARN": "color: #C3A50D",
+    "WARNING": "color: #C3A50D",
+}
+
+
+def matching_rows(
+    frame: DataFrame, text: str, positions: np.ndarray = None, columns: list = None
+) -> np.ndarray:
+    """
+    Positions of the rows with ``text`` in any of their text columns.
+
+    ``positions`` and ``columns`` limit the search to those rows and columns.
+    Matching ignores case. Categorical columns test each category once and
+    look the rows up by code, so repeated values cost nothing.
+    """
+    subset = positions is not None
+    positions = positions if subset else np.arange(len(frame))
+    if not text:
+        return positions
+    found = np.zeros(len(positions), dtype=bool)
+    for column in frame.columns if columns is None else columns:
+        values = frame[column]
+        if isinstance(values.dtype, CategoricalDtype):
+            hits = values.cat.categories.astype(str).str.contains(
+                text, case=False, regex=False
+            )
+            codes = values.cat.codes.to_numpy()[positions]
+            found |= (codes >= 0) & np.append(hits, False)[codes]
+        elif is_object_dtype(values.dtype) or is_string_dtype(values.dtype):
+            values = values.iloc[positions] if subset else values
+            try:
+                contains = values.str.contains(text, case=False, regex=False)
+            except AttributeError:
+                # No strings in the column at all
+                continue
+            found |= contains.to_numpy(dtype=bool, na_value=False)
+    return positions[found]
+
+
+def sorted_rows(
+    frame: DataFrame, positions: np.ndarray, column: str, ascending: bool = True
+) -> np.ndarray:
+    """``positions`` ordered by ``column``, keeping ties in order, NaN last."""
+    values = frame[column].iloc[positions].reset_index(drop=True)
+    order = values.sort_values(
+        ascending=ascending, kind="stable", na_position="last"
+    ).index
+    return positions[order.to_numpy()]
+
+
+def page_count(rows: int, size: int = PAGE_SIZE) -> int:
+    return max(1, -(-rows // size))
+
+
+def page_rows(positions: np.ndarray, page: int, size: int = PAGE_SIZE) -> np.ndarray:
+    """Positions on 1-based ``page``."""
+    return positions[(page - 1) * size : page * size]
+
+
+def level_styles(frame: DataFrame, level_column: str) -> DataFrame:
+    """
+    CSS of every cell, coloured by the row's log level.
+
+    Built in one dictionary lookup per row and broadcast to all columns,
+    for ``frame.style.apply(..., axis=None)``.
+    """
+    css = frame[level_column].astype(object).map(LEVEL_STYLES).fillna("")
+    return DataFrame(
+        np.repeat(css.to_numpy()[:, None], frame.shape[1], axis=1),
+        index=frame.index,
+        columns=frame.columns,
+    )
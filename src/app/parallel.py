@@ -0,0 +1,109 @@
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pyarrow as pa
+from pandas import Series
+
+# Smaller inputs are not worth the pickling and process start-up cost.
+MIN_PARALLEL_ROWS: int = 200_000
+DEFAULT_WORKERS: int = os.cpu_count() or 1
+# Cap for parsing uploads inside the Streamlit server. Every upload shares
+# the one pool of this size, so concurrent uploads do not add processes.
+SERVER_WORKERS: int = min(4, DEFAULT_WORKERS)
+
+_pools: dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Return a process pool of ``workers`` processes, shared by every caller.
+
+    Workers are spawned rather than forked, since forking the threaded
+    Streamlit server can deadlock the child.
+    """
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=get_context("spawn")
+            )
+        return _pools[workers]
+
+
+@atexit.register
+def shutdown_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(cancel_futures=True)
+        _pools.clear()
+
+
+def row_ranges(rows: int, parts: int) -> list[tuple[int, int]]:
+    """Split ``rows`` into at most ``parts`` contiguous ``(start, stop)`` ranges."""
+    bounds = np.linspace(0, rows, max(1, min(parts, rows)) + 1).astype(int)
+    return [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+
+class SharedStrings:
+    """
+    A string column placed in shared memory as Arrow buffers.
+
+    Workers attach to the buffers by name through ``spec`` and read only
+    their own row range, so the column is never pickled. Use it as a
+    context manager; the segments are released on exit.
+    """
+
+    def __init__(self, values: Series):
+        array = pa.array(values, type=pa.large_string(), from_pandas=True)
+        self.segments: list[SharedMemory | None] = []
+        sizes = []
+        for buffer in array.buffers():
+            if buffer is None:
+                self.segments.append(None)
+                sizes.append(0)
+                continue
+            segment = SharedMemory(create=True, size=max(1, buffer.size))
+            segment.buf[: buffer.size] = memoryview(buffer).cast("B")
+            self.segments.append(segment)
+            sizes.append(buffer.size)
+        self.spec: tuple = (
+            len(array),
+            [None if s is None else s.name for s in self.segments],
+            sizes,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        for segment in self.segments:
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+        self.segments = []
+        return False
+
+
+def read_shared_strings(spec: tuple, start: int, stop: int) -> list:
+    """Rows ``start:stop`` of a ``SharedStrings`` column, as Python objects."""
+    length, names, sizes = spec
+    segments = [None if name is None else SharedMemory(name=name) for name in names]
+    try:
+        buffers = [
+            None if segment is None else pa.py_buffer(segment.buf[:size])
+            for segment, size in zip(segments, sizes)
+        ]
+        array = pa.Array.from_buffers(pa.large_string(), length, buffers)
+        values = array.slice(start, stop - start).to_pylist()
+        # Views into the segments must be gone before they are closed
+        del array, buffers
+    finally:
+        for segment in segments:
+            if segment is not None:
+                segment.close()
+    return values
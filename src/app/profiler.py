@@ -0,0 +1,189 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextvars import ContextVar
+
+from pandas import DataFrame
+
+# Profiler collecting spans for the current script run, if any.
+_active: ContextVar = ContextVar("profiler", default=None)
+
+
+class Span:
+    """One timed region; ``peak_bytes`` is only set when memory is traced."""
+
+    __slots__ = (
+        "name",
+        "depth",
+        "start",
+        "wall",
+        "cpu",
+        "peak_bytes",
+        "_cpu_start",
+        "_base_bytes",
+        "_peak_seen",
+    )
+
+    def __init__(self, name: str, depth: int):
+        self.name: str = name
+        self.depth: int = depth
+        self.start: float = 0.0
+        self.wall: float = 0.0
+        self.cpu: float = 0.0
+        self.peak_bytes: int | None = None
+
+
+class Profiler:
+    """
+    Collects nested spans with wall time, CPU time and optional peak memory.
+
+    Use it as a context manager; while it is active, ``span`` blocks and
+    ``@profiled`` functions running in the same context are recorded.
+    Without an active profiler they cost a single context variable lookup.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory: bool = trace_memory
+        self.spans: list[Span] = []
+        self._stack: list[Span] = []
+        self._origin: float = time.perf_counter()
+        self._token = None
+        self._started_tracing: bool = False
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._token = _active.set(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _active.reset(self._token)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    def _open(self, name: str) -> Span:
+        span = Span(name, len(self._stack))
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent._peak_seen = max(parent._peak_seen, peak)
+            tracemalloc.reset_peak()
+            span._base_bytes = current
+            span._peak_seen = current
+        self._stack.append(span)
+        self.spans.append(span)
+        span._cpu_start = time.process_time()
+        span.start = time.perf_counter()
+        return span
+
+    def _close(self, span: Span):
+        end = time.perf_counter()
+        span.cpu = time.process_time() - span._cpu_start
+        span.wall = end - span.start
+        span.start -= self._origin
+        self._stack.pop()
+        if self.trace_memory and tracemalloc.is_tracing():
+            peak = max(span._peak_seen, tracemalloc.get_traced_memory()[1])
+            span.peak_bytes = peak - span._base_bytes
+            if self._stack:
+                parent = self._stack[-1]
+                parent._peak_seen = max(parent._peak_seen, peak)
+
+    def summary(self) -> DataFrame:
+        """Totals per span name, slowest first."""
+        records = DataFrame(
+            [
+                {
+                    "Stage": span.name,
+                    "Wall (s)": span.wall,
+                    "CPU (s)": span.cpu,
+                    "Peak Memory (MiB)": (
+                        None if span.peak_bytes is None else span.peak_bytes / 2**20
+                    ),
+                }
+                for span in self.spans
+            ],
+            columns=["Stage", "Wall (s)", "CPU (s)", "Peak Memory (MiB)"],
+        )
+        summary = records.groupby("Stage", sort=False).agg(
+            {
+                "Wall (s)": "sum",
+                "CPU (s)": "sum",
+                "Peak Memory (MiB)": "max",
+            }
+        )
+        summary.insert(0, "Calls", records.groupby("Stage", sort=False).size())
+        return summary.sort_values("Wall (s)", ascending=False)
+
+    def to_chrome_trace(self) -> dict:
+        """Spans as Chrome trace events, viewable in Perfetto or chrome://tracing."""
+        pid, tid = os.getpid(), threading.get_ident()
+        events = []
+        for span in self.spans:
+            args = {"cpu_ms": round(span.cpu * 1000, 3)}
+            if span.peak_bytes is not None:
+                args["peak_mib"] = round(span.peak_bytes / 2**20, 3)
+            events.append(
+                {
+                    "name": span.name,
+                    "ph": "X",
+                    "ts": round(span.start * 1e6, 3),
+                    "dur": round(span.wall * 1e6, 3),
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_chrome_trace(), indent=2)
+
+
+class span:
+    """Record the enclosed block on the active profiler, if there is one."""
+
+    __slots__ = ("name", "_profiler", "_span")
+
+    def __init__(self, name: str):
+        self.name: str = name
+
+    def __enter__(self):
+        self._profiler = _active.get()
+        if self._profiler is not None:
+            self._span = self._profiler._open(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._profiler is not None:
+            self._profiler._close(self._span)
+        return False
+
+
+def profiled(fn):
+    """Record every call of ``fn`` as a span named after it."""
+    name = fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        profiler = _active.get()
+        if profiler is None:
+            return fn(*args, **kwargs)
+        current = profiler._open(name)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler._close(current)
+
+    return wrapper
+
+
+def active_profiler() -> Profiler | None:
+    return _active.get()
@@ -0,0 +1,170 @@
+import re
+import sys
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pandas import CategoricalDtype, DataFrame, Series, factorize
+
+from app.profiler import profiled
+
+# Tokens are runs of ASCII letters, digits and underscores, lower-cased;
+# everything else separates them. Queries are tokenized the same way.
+TOKEN_SEPARATOR: str = r"[^0-9A-Za-z_]+"
+_TOKEN = re.compile(r"[0-9a-z_]+")
+# A quoted phrase or a bare word of a query.
+_QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    # A sort and a neighbour comparison; np.unique is far slower on large input
+    values = np.sort(values)
+    first = np.ones(min(len(values), 1), dtype=bool)
+    return values[np.concatenate([first, values[1:] != values[:-1]])]
+
+
+class MessageIndex:
+    """
+    Inverted token index over a log's messages.
+
+    Distinct messages are tokenized once, in Arrow, and every token maps to
+    the sorted ids of the distinct messages holding it. Queries combine
+    these posting lists and only then expand them to log rows, so a search
+    costs in proportion to its hits, not to the log.
+
+    ``search`` takes space-separated parts that must all match: ``word``,
+    ``prefix*`` and ``"a quoted phrase"``. Matching ignores case.
+    """
+
+    @profiled
+    def __init__(self, messages: Series):
+        codes, texts = factorize(messages.to_numpy())
+        self.rows: int = len(codes)
+        # Row positions grouped by distinct message, in log order within each
+        self._row_order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(texts))
+        self._row_offsets = np.concatenate([[0], np.cumsum(counts)]) + int(
+            (codes < 0).sum()
+        )
+
+        lowered = pc.utf8_lower(pa.array(texts, type=pa.large_string()))
+        split = pc.split_pattern_regex(lowered, TOKEN_SEPARATOR)
+        tokens, parents = pc.list_flatten(split), pc.list_parent_indices(split)
+        kept = pc.not_equal(tokens, "")
+        encoded = pc.dictionary_encode(tokens.filter(kept))
+        # Sorted vocabulary, so a prefix is a contiguous range of it
+        order = pc.array_sort_indices(encoded.dictionary).to_numpy()
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        token_ids = rank[encoded.indices.to_numpy()]
+        pairs = _sorted_unique(token_ids * len(texts) + parents.filter(kept).to_numpy())
+
+        self.vocabulary: np.ndarray = encoded.dictionary.take(order).to_numpy(
+            zero_copy_only=False
+        )
+        self._postings = (pairs % max(len(texts), 1)).astype(np.int64)
+        self._token_offsets = np.searchsorted(
+            pairs // max(len(texts), 1), np.arange(len(self.vocabulary) + 1)
+        )
+        self._texts = lowered
+        # Tokens are ASCII, so each is an empty string plus a byte per letter
+        self._vocabulary_bytes: int = (
+            self.vocabulary.nbytes
+            + len(self.vocabulary) * sys.getsizeof("")
+            + (pc.sum(pc.binary_length(encoded.dictionary)).as_py() or 0)
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the index, for sizing it in a cache."""
+        arrays = (
+            self._row_order,
+            self._row_offsets,
+            self._postings,
+            self._token_offsets,
+            self._texts,
+        )
+        return sum(array.nbytes for array in arrays) + self._vocabulary_bytes
+
+    def _postings_of(self, first: int, last: int) -> np.ndarray:
+        """Distinct messages holding any of the tokens ``first:last``."""
+        found = self._postings[self._token_offsets[first] : self._token_offsets[last]]
+        return found if last - first == 1 else _sorted_unique(found)
+
+    def _term(self, token: str) -> np.ndarray:
+        at = self.vocabulary.searchsorted(token)
+        if at < len(self.vocabulary) and self.vocabulary[at] == token:
+            return self._postings_of(at, at + 1)
+        return np.zeros(0, dtype=np.int64)
+
+    def _prefix(self, prefix: str) -> np.ndarray:
+        first = self.vocabulary.searchsorted(prefix)
+        last = self.vocabulary.searchsorted(prefix + "\U0010ffff")
+        return self._postings_of(first, last)
+
+    def _phrase(self, tokens: list) -> np.ndarray:
+        """Messages with ``tokens`` adjacent and in order."""
+        candidates = self._all_of([self._term(token) for token in tokens])
+        if len(tokens) < 2 or not len(candidates):
+            return candidates
+        # Tokens are plain words, so they need no escaping in the pattern
+        pattern = "(^|[^0-9a-z_])" + TOKEN_SEPARATOR.join(tokens) + "([^0-9a-z_]|$)"
+        texts = self._texts.take(pa.array(candidates))
+        return candidates[pc.match_substring_regex(texts, pattern).to_numpy(False)]
+
+    @staticmethod
+    def _all_of(postings: list) -> np.ndarray:
+        if not postings:
+            return np.zeros(0, dtype=np.int64)
+        postings = sorted(postings, key=len)
+        found = postings[0]
+        for other in postings[1:]:
+            found = np.intersect1d(found, other, assume_unique=True)
+        return found
+
+    def _expand(self, messages: np.ndarray) -> np.ndarray:
+        """Sorted row positions of distinct messages."""
+        starts = self._row_offsets[messages]
+        lengths = self._row_offsets[messages + 1] - starts
+        shifts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return np.sort(self._row_order[shifts + np.arange(lengths.sum())])
+
+    @profiled
+    def search(self, query: str) -> np.ndarray:
+        """
+        Sorted row positions matching every part of ``query``.
+
+        A blank query matches every row; one without any word, such as
+        ``!!``, matches none.
+        """
+        parts = []
+        for phrase, word in _QUERY_PART.findall(query.lower()):
+            if word.endswith("*") and _TOKEN.fullmatch(word[:-1]):
+                parts.append(self._prefix(word[:-1]))
+                continue
+            tokens = _TOKEN.findall(phrase or word)
+            if tokens:
+                parts.append(self._phrase(tokens))
+        if not parts:
+            return np.arange(self.rows if not query.strip() else 0)
+        return self._expand(self._all_of(parts))
+
+
+def restrict(logs: DataFrame, rows: np.ndarray, filters: dict) -> np.ndarray:
+    """Rows whose columns hold one of the values given per column in ``filters``."""
+    for column, values in filters.items():
+        if not values:
+            continue
+        series = logs[column]
+        if isinstance(series.dtype, CategoricalDtype):
+            wanted = series.cat.categories.get_indexer(values)
+            kept = np.isin(series.cat.codes.to_numpy()[rows], wanted[wanted >= 0])
+        else:
+            kept = np.isin(series.to_numpy()[rows], values)
+        rows = rows[kept]
+    return rows
+
+
+def split_values(text: str) -> list:
+    """The comma-separated values of a filter input, without blanks."""
+    return [value.strip() for value in text.split(",") if value.strip()]
@@ -0,0 +1,148 @@
+import numpy as np
+from pandas import DataFrame
+
+# Relative error of every quantile a sketch reports.
+DEFAULT_ACCURACY: float = 0.01
+# Magnitudes below this are counted as zero.
+MIN_INDEXABLE: float = 1e-9
+
+
+class _Buckets:
+    """Dense counts of consecutive bucket indices starting at ``offset``."""
+
+    def __init__(self):
+        self.offset: int = 0
+        self.counts: np.ndarray = np.zeros(0, np.int64)
+
+    def add(self, indices: np.ndarray, weights: np.ndarray = None):
+        if not len(indices):
+            return
+        lo, hi = int(indices.min()), int(indices.max()) + 1
+        if len(self.counts):
+            lo, hi = min(lo, self.offset), max(hi, self.offset + len(self.counts))
+        counts = np.zeros(hi - lo, np.int64)
+        counts[self.offset - lo : self.offset - lo + len(self.counts)] = self.counts
+        counts += np.bincount(indices - lo, weights=weights, minlength=hi - lo).astype(
+            np.int64
+        )
+        self.offset, self.counts = lo, counts
+
+    def indices(self) -> np.ndarray:
+        return np.arange(self.offset, self.offset + len(self.counts))
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative error ``accuracy`` (DDSketch).
+
+    A value ``x`` is counted in bucket ``ceil(log(x) / log(gamma))``, so
+    memory grows with the logarithm of the value range rather than the
+    number of values, and any quantile is reported within ``accuracy`` of
+    its true value. Sketches of separate chunks merge by adding counts.
+    """
+
+    def __init__(self, accuracy: float = DEFAULT_ACCURACY):
+        self.accuracy: float = accuracy
+        self.gamma: float = (1 + accuracy) / (1 - accuracy)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.min: float = np.inf
+        self.max: float = -np.inf
+        self.zeros: int = 0
+        self._positive = _Buckets()
+        self._negative = _Buckets()
+
+    @classmethod
+    def from_values(cls, values, accuracy: float = DEFAULT_ACCURACY):
+        sketch = cls(accuracy)
+        sketch.add(values)
+        return sketch
+
+    def add(self, values):
+        """Count every value that is not NaN."""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        magnitudes = np.abs(values)
+        indexable = magnitudes >= MIN_INDEXABLE
+        self.zeros += int((~indexable).sum())
+        indices = np.ceil(np.log(magnitudes[indexable]) / np.log(self.gamma))
+        negative = values[indexable] < 0
+        self._positive.add(indices[~negative].astype(np.int64))
+        self._negative.add(indices[negative].astype(np.int64))
+
+    def merge(self, other: "QuantileSketch"):
+        """Add the counts of a sketch built with the same accuracy."""
+        if other.gamma != self.gamma:
+            raise ValueError("Sketches of different accuracy cannot be merged.")
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.zeros += other.zeros
+        for mine, theirs in (
+            (self._positive, other._positive),
+            (self._negative, other._negative),
+        ):
+            mine.add(theirs.indices(), theirs.counts)
+        return self
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else np.nan
+
+    def _values(self, indices: np.ndarray) -> np.ndarray:
+        """Representative value of buckets, within ``accuracy`` of any member."""
+        return 2 * self.gamma ** indices.astype(float) / (self.gamma + 1)
+
+    def _ordered(self) -> tuple[np.ndarray, np.ndarray]:
+        """Bucket values in ascending order with their counts."""
+        values = np.concatenate(
+            [
+                -self._values(self._negative.indices())[::-1],
+                [0.0],
+                self._values(self._positive.indices()),
+            ]
+        )
+        counts = np.concatenate(
+            [self._negative.counts[::-1], [self.zeros], self._positive.counts]
+        )
+        return values, counts
+
+    def quantiles(self, qs) -> np.ndarray:
+        """Values at the quantiles ``qs`` (between 0 and 1), NaN when empty."""
+        qs = np.asarray(qs, dtype=float)
+        if not self.count:
+            return np.full(qs.shape, np.nan)
+        values, counts = self._ordered()
+        ranks = qs * (self.count - 1)
+        found = np.cumsum(counts).searchsorted(ranks, side="right")
+        return np.clip(values[found], self.min, self.max)
+
+    def quantile(self, q: float) -> float:
+        return float(self.quantiles([q])[0])
+
+    def histogram(self, bins: int = 30) -> DataFrame:
+        """
+        Counts in at most ``bins`` groups of neighbouring buckets.
+
+        Buckets grow geometrically, so the groups form a log-scale
+        histogram, each group labelled by the value of its first bucket.
+        """
+        values, counts = self._ordered()
+        used = np.flatnonzero(counts)
+        if not len(used):
+            return DataFrame({"From": [], "Count": []})
+        values, counts = values[used[0] : used[-1] + 1], counts[used[0] : used[-1] + 1]
+        starts = np.unique(np.linspace(0, len(values), bins + 1).astype(int)[:-1])
+        return DataFrame(
+            {
+                "From": np.clip(values[starts], self.min, self.max),
+                "Count": np.add.reduceat(counts, starts),
+            }
+        )
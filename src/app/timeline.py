@@ -0,0 +1,177 @@
+import numpy as np
+from pandas import DataFrame, Series, concat, isna, to_datetime
+
+from app.profiler import profiled
+
+# Points per concurrency series and bars per Gantt chart sent to the browser.
+MAX_POINTS: int = 2_000
+MAX_BARS: int = 300
+
+
+def _nanoseconds(values: Series) -> np.ndarray:
+    """UTC nanoseconds of a datetime column, NaT included as int64 min."""
+    utc = to_datetime(values, utc=True).dt.tz_convert(None)
+    return utc.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+class Intervals:
+    """
+    Time intervals kept as start-sorted arrays, for overlap queries.
+
+    Intervals are half-open ``[start, end)`` in UTC nanoseconds. Starts are
+    sorted with their ends and labels, and a separately sorted copy of the
+    ends lets the number of running intervals at any time be counted with
+    two binary searches.
+    """
+
+    def __init__(self, starts: Series, ends: Series, labels: Series = None):
+        starts = Series(starts).reset_index(drop=True)
+        ends = Series(ends).reset_index(drop=True)
+        labels = (
+            Series(range(len(starts)))
+            if labels is None
+            else Series(labels).reset_index(drop=True)
+        )
+        known = ~(isna(starts) | isna(ends))
+        start_ns = _nanoseconds(starts[known])
+        end_ns = _nanoseconds(ends[known])
+        order = np.argsort(start_ns, kind="stable")
+        self.starts: np.ndarray = start_ns[order]
+        self.ends: np.ndarray = np.maximum(end_ns[order], self.starts)
+        self.labels: np.ndarray = labels[known].to_numpy()[order]
+        self.sorted_ends: np.ndarray = np.sort(self.ends)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def span(self) -> tuple[int, int] | None:
+        """First start and last end, or None when there are no intervals."""
+        if not len(self):
+            return None
+        return int(self.starts[0]), int(self.sorted_ends[-1])
+
+    def active_at(self, times: np.ndarray) -> np.ndarray:
+        """Number of intervals running at each of ``times``."""
+        started = self.starts.searchsorted(times, side="right")
+        ended = self.sorted_ends.searchsorted(times, side="right")
+        return started - ended
+
+    def overlapping(self, start: int, end: int) -> np.ndarray:
+        """Positions of the intervals that overlap ``[start, end)``."""
+        candidates = self.starts.searchsorted(end, side="left")
+        return np.flatnonzero(self.ends[:candidates] > start)
+
+    @profiled
+    def concurrency(self) -> DataFrame:
+        """
+        Exact number of running intervals after every start or end.
+
+        A sweep line over the sorted events: ends sort before starts at the
+        same instant, so touching intervals do not count as overlapping.
+        """
+        times = np.concatenate([self.sorted_ends, self.starts])
+        steps = np.concatenate(
+            [np.full(len(self), -1, np.int64), np.ones(len(self), np.int64)]
+        )
+        order = np.lexsort((steps, times))
+        times, levels = times[order], np.cumsum(steps[order])
+        # Only the level after the last event at each instant is kept
+        last = np.r_[times[1:] != times[:-1], True]
+        return DataFrame(
+            {
+                "Time": to_datetime(times[last], utc=True),
+                "Concurrency": levels[last],
+            }
+        )
+
+    def peak_concurrency(self, edges: np.ndarray) -> np.ndarray:
+        """
+        Highest concurrency within each bucket ``[edges[i], edges[i + 1])``.
+
+        Downsampling by bucket maximum keeps short spikes visible, which
+        sampling the level at fixed times would miss.
+        """
+        peaks = self.active_at(edges[:-1])
+        if not len(self):
+            return peaks
+        profile = self.concurrency()
+        times = profile["Time"].array.asi8
+        bucket = edges.searchsorted(times, side="right") - 1
+        inside = (bucket >= 0) & (bucket < len(peaks))
+        np.maximum.at(peaks, bucket[inside], profile["Concurrency"].to_numpy()[inside])
+        return peaks
+
+
+def time_edges(start: int, end: int, points: int = MAX_POINTS) -> np.ndarray:
+    """Evenly spaced bucket edges covering ``[start, end]`` in nanoseconds."""
+    return np.linspace(start, max(end, start + 1), points + 1).astype(np.int64)
+
+
+@profiled
+def concurrency_chart(series: dict, points: int = MAX_POINTS) -> DataFrame:
+    """
+    Downsampled concurrency of several interval sets on shared buckets.
+
+    ``series`` maps a name to its ``Intervals``; the result is indexed by
+    bucket start time with one column of peak concurrency per name.
+    """
+    spans = [intervals.span() for intervals in series.values() if len(intervals)]
+    if not spans:
+        return DataFrame(columns=list(series))
+    edges = time_edges(
+        min(start for start, _ in spans), max(end for _, end in spans), points
+    )
+    return DataFrame(
+        {name: intervals.peak_concurrency(edges) for name, intervals in series.items()},
+        index=to_datetime(edges[:-1], utc=True).rename("Time"),
+    )
+
+
+def plugin_intervals(parser, plugins: DataFrame) -> Intervals:
+    """Plugin sessions from ``parse_plugin_summary`` as intervals."""
+    timestamps = parser.logs[parser.TIMESTAMP]
+    starts = timestamps.reindex(plugins[parser.start_index].fillna(-1).to_numpy())
+    ends = timestamps.reindex(plugins[parser.end_index].fillna(-1).to_numpy())
+    # Runs that never finished were still running when the log ends
+    return Intervals(starts, ends.fillna(timestamps.max()), plugins[parser.plugin_name])
+
+
+def query_intervals(parser, queries: DataFrame) -> Intervals:
+    """Queries from ``parse_queries`` as intervals."""
+    ends = queries["End Executions Time"].fillna(parser.logs[parser.TIMESTAMP].max())
+    return Intervals(
+        queries["Start Executions Time"],
+        ends,
+        queries[parser.MESSAGE].str.slice(0, 120),
+    )
+
+
+def gantt_rows(series: dict, start: int, end: int, limit: int = MAX_BARS) -> DataFrame:
+    """
+    The longest intervals overlapping ``[start, end)`` as Gantt chart rows.
+
+    Only ``limit`` bars are returned across all series so the chart stays
+    responsive however many intervals overlap the window.
+    """
+    columns = ["Kind", "Label", "Start", "End"]
+    frames = [DataFrame(columns=columns)]
+    for name, intervals in series.items():
+        rows = intervals.overlapping(start, end)
+        frames.append(
+            DataFrame(
+                {
+                    "Kind": name,
+                    "Label": intervals.labels[rows],
+                    "Start": intervals.starts[rows],
+                    "End": intervals.ends[rows],
+                },
+                columns=columns,
+            )
+        )
+    rows = concat([frame for frame in frames if len(frame)] or frames[:1])
+    rows = rows.astype({"Start": np.int64, "End": np.int64})
+    rows["Seconds"] = (rows["End"] - rows["Start"]) / 1e9
+    rows = rows.nlargest(limit, "Seconds").sort_values("Start")
+    rows["Start"] = to_datetime(rows["Start"], utc=True)
+    rows["End"] = to_datetime(rows["End"], utc=True)
+    return rows.reset_index(drop=True)
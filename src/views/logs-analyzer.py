@@ -1,182 +1,515 @@
+import altair as alt
+import numpy as np
 import streamlit as st
-import pandas as pd
 
-from statistics import mean
+from contextlib import nullcontext
 
-from app.log_parser import LogParser
-from app.time_it import timeit
+from app.comparison import REGRESSION, compare_fingerprints, compare_plugins
+from app.error_clusters import cluster_errors
+from app.log_cache import LRUCache, content_hash
+from app.log_reader import UPLOAD_TYPES
+from app.pagination import (
+    level_styles,
+    matching_rows,
+    page_count,
+    page_rows,
+    sorted_rows,
+)
+from app.log_store import load_parser
+from app.profiler import Profiler
+from app.search import MessageIndex, restrict, split_values
+from app.sketch import QuantileSketch
+from app.timeline import (
+    concurrency_chart,
+    gantt_rows,
+    plugin_intervals,
+    query_intervals,
+)
 
 
 st.title("🫧 Logs Analyzer")
 
 
-@timeit
-def read_log(_file):
-    data = pd.read_csv(
-        _file,
-        on_bad_lines="skip",
-        # low_memory=False,
-        engine="python",
-        dtype=str,
+@st.cache_resource
+def get_result_cache() -> LRUCache:
+    """Parse results shared by all sessions, bounded by estimated size."""
+    return LRUCache()
+
+
+def upload_key(_file, is_warn: bool) -> tuple:
+    """Cache key of an upload: its content hash plus the parser options."""
+    hashes = st.session_state.setdefault("log_upload_hashes", {})
+    file_id = getattr(_file, "file_id", None) or _file.name
+    if file_id not in hashes:
+        hashes[file_id] = content_hash(_file)
+    return hashes[file_id], is_warn
+
+
+def parse_results(parser, key: tuple, name: str):
+    """
+    Cached ``"plugin_sessions"``, ``"plugins"``, ``"queries"`` or
+    ``"computations"`` of an upload. The plugin summary is taken from the
+    cached sessions, so every tab shares one plugin parse.
+    """
+    if name == "plugins":
+        return parse_results(parser, key, "plugin_sessions").summary
+    return get_result_cache().get_or_compute(
+        key + (name,), getattr(parser, f"parse_{name}")
     )
-    return data
 
 
-uploaded_file = st.file_uploader("Upload a log file (csv)", type="csv")
+def show_performance_panel(profiler: Profiler):
+    """Stage timings of this run, with a Chrome trace download."""
+    st.subheader("⏱️ Performance")
+    st.dataframe(profiler.summary())
+    st.download_button(
+        "Download Chrome trace",
+        profiler.to_json(),
+        file_name="logs-analyzer-trace.json",
+        mime="application/json",
+    )
 
-if uploaded_file:
-    # plugin_tab, queries_tab, computations_tab = st.tabs(["Plugins", "Queries", "Computations])
-    queries_tab, plugin_tab, computations_tab = st.tabs(
-        ["Queries", "Plugins", "Computations"]
+
+def show_time_distribution(sketch: QuantileSketch):
+    """Percentiles and a log-scale histogram of a sketch of times."""
+    p50, p90, p99 = sketch.quantiles([0.5, 0.9, 0.99])
+    for column, label, value in zip(
+        st.columns(3), ["P50", "P90", "P99"], [p50, p90, p99]
+    ):
+        with column:
+            st.metric(f"📈 {label} Time", "N/A" if np.isnan(value) else f"{value:.2f}s")
+    if sketch.count:
+        st.altair_chart(
+            alt.Chart(sketch.histogram())
+            .mark_bar()
+            .encode(
+                x=alt.X(
+                    "From:O", sort=None, title="Seconds", axis=alt.Axis(format=".3~g")
+                ),
+                y="Count:Q",
+            ),
+            width="stretch",
+        )
+
+
+def show_table(
+    frame,
+    name: str,
+    cache_key: tuple,
+    level_column: str = None,
+    extend=None,
+    rows=None,
+    columns: list = None,
+):
+    """
+    One page of ``frame``, filtered and sorted on the server.
+
+    Row orders are cached per filter and sort, so each rerun only slices,
+    styles and sends the visible page. ``extend`` adds derived columns to
+    that page; ``level_column`` colours its rows by log level. ``rows`` and
+    ``columns`` show only those positions and columns of ``frame``, without
+    copying it.
+    """
+    original_order = "(default order)"
+    filter_column, sort_column, order_column, page_column = st.columns([3, 2, 1, 1])
+    with filter_column:
+        text = st.text_input("Filter", key=f"{name}-filter")
+    with sort_column:
+        sort_by = st.selectbox(
+            "Sort by",
+            [original_order, *(frame.columns if columns is None else columns)],
+            key=f"{name}-sort",
+        )
+    with order_column:
+        descending = st.toggle("Descending", key=f"{name}-descending")
+
+    def row_order():
+        positions = matching_rows(frame, text, rows, columns)
+        if sort_by == original_order:
+            return positions[::-1] if descending else positions
+        return sorted_rows(frame, positions, sort_by, ascending=not descending)
+
+    positions = get_result_cache().get_or_compute(
+        cache_key + ("rows", text, sort_by, descending), row_order
     )
-    try:
-        log_data = read_log(uploaded_file)
-        parser = LogParser(log_data)
-    except Exception as e:
-        st.error(f"❌ Failed to parse log: {e}")
-        exit(1)
+    pages = page_count(len(positions))
+    # A narrower filter can leave the remembered page past the end
+    st.session_state[f"{name}-page"] = min(
+        st.session_state.get(f"{name}-page", 1), pages
+    )
+    with page_column:
+        page = st.number_input("Page", 1, pages, key=f"{name}-page")
+
+    shown = frame.iloc[page_rows(positions, page)]
+    if columns is not None:
+        shown = shown[columns]
+    if extend is not None:
+        shown = extend(shown)
+    if level_column is not None:
+        styles = level_styles(shown, level_column)
+        shown = shown.style.apply(lambda _: styles, axis=None)
+    st.dataframe(shown)
+    total = len(frame) if rows is None else len(rows)
+    st.caption(f"{len(positions):,} of {total:,} rows, page {page} of {pages}")
 
-    with plugin_tab:
-        plugins = parser.parse_plugins()
 
+uploaded_file = st.file_uploader(
+    "Upload a log file (csv, or gzip/zstd/zip compressed csv)", type=UPLOAD_TYPES
+)
+compare_file = st.file_uploader(
+    "Upload a later log to compare against (optional)",
+    type=UPLOAD_TYPES,
+    key="compare-upload",
+)
+is_warn = st.checkbox("Include WARN lines in plugin logs", value=False)
+show_profile = st.toggle("Performance panel", value=False)
+trace_memory = show_profile and st.checkbox("Trace peak memory (slower)", value=False)
+
+if uploaded_file:
+    profiler = Profiler(trace_memory) if show_profile else nullcontext()
+    with profiler:
+        # Only the selected analysis is computed; st.tabs would run them all
+        selected_tab = st.radio(
+            "Analysis",
+            ["Queries", "Plugins", "Computations", "Timeline", "Search"]
+            + (["Comparison"] if compare_file else []),
+            horizontal=True,
+            label_visibility="collapsed",
+        )
+        result_cache = get_result_cache()
         try:
+            key = upload_key(uploaded_file, is_warn)
+            parser = result_cache.get_or_compute(
+                key + ("parser",), lambda: load_parser(uploaded_file, key[0], is_warn)
+            )
+        except Exception as e:
+            st.error(f"❌ Failed to parse log: {e}")
+            exit(1)
+
+        if selected_tab == "Plugins":
+            sessions = parse_results(parser, key, "plugin_sessions")
+            plugins = sessions.summary
+
+            times = plugins[parser.time_taken].dropna()
             total_plugins = len(plugins)
-            failed_plugins = sum(d[parser.is_error] for d in plugins)
-            total_time = sum(d[parser.time_taken] for d in plugins)
-            avg_time = mean(d[parser.time_taken] for d in plugins)
-
-        except TypeError:
-            print(d[parser.is_error] for d in plugins)
-            total_plugins = 0
-            failed_plugins = 0
-            total_time = 0
-            avg_time = 0
-
-        # Display summary metrics
-        st.markdown("---")
-        st.subheader(f"Summary")
-        total_plugin, failed_plugin, total_time_header, avg_time_header = st.columns(4)
-        with total_plugin:
-            st.metric("📊 Total Plugins", total_plugins)
-        with failed_plugin:
-            st.metric("⛔ Failed", failed_plugins)
-        with total_time_header:
-            st.metric("⏱️ Total Time", f"{total_time:.2f}s" if total_time else "N/A")
-        with avg_time_header:
-            st.metric("⚡ Avg Time", f"{avg_time:.2f}s" if avg_time else "N/A")
-        st.markdown("---")
-
-        if len(plugins) > 0:
-            st.subheader(f"Plugin Details")
-            # with st.expander(f"Plugin Summary", expanded=True):
-            df = pd.DataFrame(plugins)
-            st.dataframe(
-                df[
-                    [
-                        parser.plugin_name,
-                        parser.is_error,
-                        parser.READ_TIME,
-                        parser.EXEC_TIME,
-                        parser.WRITE_TIME,
-                        parser.time_taken,
-                        parser.OUTPUT_MEASURES,
-                    ]
-                ].sort_values(by=[parser.time_taken], ascending=False)
+            failed_plugins = int(plugins[parser.is_error].sum())
+            total_time = times.sum()
+            avg_time = times.mean() if len(times) else 0
+
+            # Display summary metrics
+            st.markdown("---")
+            st.subheader(f"Summary")
+            total_plugin, failed_plugin, total_time_header, avg_time_header = (
+                st.columns(4)
+            )
+            with total_plugin:
+                st.metric("📊 Total Plugins", total_plugins)
+            with failed_plugin:
+                st.metric("⛔ Failed", failed_plugins)
+            with total_time_header:
+                st.metric(
+                    "⏱️ Total Time", f"{total_time:.2f}s" if total_time else "N/A"
+                )
+            with avg_time_header:
+                st.metric("⚡ Avg Time", f"{avg_time:.2f}s" if avg_time else "N/A")
+            show_time_distribution(
+                result_cache.get_or_compute(
+                    key + ("plugin_sketch",),
+                    lambda: parser.time_sketch("plugins", plugins),
+                )
             )
             st.markdown("---")
 
-        st.subheader(f"Plugin With Errors")
-        all_plugin_success: bool = True
-        for plugin_tab in plugins:
-            if plugin_tab[parser.is_error]:
-                all_plugin_success = False
-                with st.expander(f"{plugin_tab[parser.plugin_name]}", expanded=True):
-                    df = plugin_tab[parser.DATA][
-                        [parser.TIMESTAMP, parser.LEVEL, parser.MESSAGE]
-                    ]
-
-                    def highlight_row(row):
-                        if row[parser.LEVEL] == "ERROR":
-                            return ["color: #C30B0B"] * len(row)
-                        if (
-                            row[parser.LEVEL] == "WARN"
-                            or row[parser.LEVEL] == "WARNING"
-                        ):
-                            return ["color: #C3A50D"] * len(row)
-
-                        return [""] * len(row)
-
-                    styled = df.style.apply(highlight_row, axis=1)
-                    st.dataframe(styled)
-        if not all_plugin_success:
-            st.subheader(f"Successful Plugins")
-            for plugin_tab in plugins:
-                if not plugin_tab[parser.is_error]:
-                    with st.expander(
-                        f"{plugin_tab[parser.plugin_name]}", expanded=False
-                    ):
-                        st.dataframe(
-                            plugin_tab[parser.DATA][
-                                [parser.TIMESTAMP, parser.LEVEL, parser.MESSAGE]
-                            ]
-                        )
-
-        st.markdown("---")
-    with queries_tab:
-        try:
-            queries = parser.parse_queries()
-            total_queries = len(queries)
-            queries_above_5min = len(queries[queries[parser.time_taken] > 300])
-            total_queries_time = sum(queries[parser.time_taken])
-            avg_query_time = total_queries_time / total_queries
+            if len(plugins) > 0:
+                st.subheader(f"Plugin Details")
+                # with st.expander(f"Plugin Summary", expanded=True):
+                details = result_cache.get_or_compute(
+                    key + ("plugin_details",),
+                    lambda: plugins[
+                        [
+                            parser.plugin_name,
+                            parser.is_error,
+                            parser.READ_TIME,
+                            parser.EXEC_TIME,
+                            parser.WRITE_TIME,
+                            parser.time_taken,
+                            parser.OUTPUT_MEASURES,
+                        ]
+                    ].sort_values(by=[parser.time_taken], ascending=False),
+                )
+                show_table(details, "plugin-details", key + ("plugin_details",))
+                st.markdown("---")
+
+            st.subheader(f"Error Clusters")
+            clusters = result_cache.get_or_compute(
+                key + ("error_clusters",), lambda: cluster_errors(parser, sessions)
+            )
+            show_table(clusters, "error-clusters", key + ("error_clusters",))
+            st.markdown("---")
+
+            st.subheader(f"Plugin With Errors")
+            failed = plugins[plugins[parser.is_error]]
+            for session, plugin in failed.iterrows():
+                with st.expander(f"{plugin[parser.plugin_name]}", expanded=True):
+                    show_table(
+                        parser.plugin_logs(session, sessions)[
+                            [parser.TIMESTAMP, parser.LEVEL, parser.MESSAGE]
+                        ],
+                        f"plugin-errors-{session}",
+                        key + ("plugin_logs", session),
+                        level_column=parser.LEVEL,
+                    )
+            if len(failed) > 0:
+                st.subheader(f"Successful Plugins")
+                for session, plugin in plugins[~plugins[parser.is_error]].iterrows():
+                    with st.expander(f"{plugin[parser.plugin_name]}", expanded=False):
+                        # Expander bodies always run, so slices wait for the toggle
+                        if st.toggle("Show log lines", key=f"plugin-logs-{session}"):
+                            show_table(
+                                parser.plugin_logs(session, sessions)[
+                                    [parser.TIMESTAMP, parser.LEVEL, parser.MESSAGE]
+                                ],
+                                f"plugin-lines-{session}",
+                                key + ("plugin_logs", session),
+                                level_column=parser.LEVEL,
+                            )
+
+            st.markdown("---")
+        elif selected_tab == "Queries":
+            try:
+                queries = result_cache.get_or_compute(
+                    key + ("queries",), parser.parse_queries
+                )
+                total_queries = len(queries)
+                queries_above_5min = len(queries[queries[parser.time_taken] > 300])
+                total_queries_time = queries[parser.time_taken].sum()
+                avg_query_time = total_queries_time / total_queries
+                st.markdown("---")
+                st.subheader(f"Summary")
+                q_total, q_long, q_total_time, q_avg = st.columns(4)
+                with q_total:
+                    st.metric("📊 Total Queries", total_queries)
+                with q_long:
+                    st.metric("⏱️ Long Queries (above 5 mins)", queries_above_5min)
+                with q_total_time:
+                    st.metric(
+                        "⏱️ Total Time",
+                        f"{total_queries_time:.2f}s" if total_queries_time else "N/A",
+                    )
+                with q_avg:
+                    st.metric(
+                        "⚡ Avg Time",
+                        f"{avg_query_time:.2f}s" if avg_query_time else "N/A",
+                    )
+                show_time_distribution(
+                    result_cache.get_or_compute(
+                        key + ("query_sketch",),
+                        lambda: parser.time_sketch("queries", queries),
+                    )
+                )
+                if total_queries > 0:
+                    st.subheader(f"Query Patterns")
+                    patterns = result_cache.get_or_compute(
+                        key + ("query_patterns",),
+                        lambda: parser.aggregate_queries(queries),
+                    )
+                    show_table(patterns, "query-patterns", key + ("query_patterns",))
+
+                    st.subheader(f"Queries Details")
+                    show_table(
+                        queries,
+                        "queries",
+                        key + ("queries",),
+                        extend=lambda rows: rows.assign(
+                            **{
+                                parser.duration_mm_ss: parser.format_durations(
+                                    rows[parser.time_taken]
+                                )
+                            }
+                        ),
+                    )
+
+            except Exception as e:
+                st.error(f"❌ Failed to parse log: {e}")
+                exit(1)
+            st.markdown("---")
+        elif selected_tab == "Computations":
+            computations = result_cache.get_or_compute(
+                key + ("computations",), parser.parse_computations
+            )
+            total_computations = len(computations)
+            total_computations_time = sum(computations[parser.time_taken])
+            avg_comp_time = total_computations_time / total_computations
             st.markdown("---")
             st.subheader(f"Summary")
-            q_total, q_long, q_total_time, q_avg = st.columns(4)
-            with q_total:
-                st.metric("📊 Total Queries", total_queries)
-            with q_long:
-                st.metric("⏱️ Long Queries (above 5 mins)", queries_above_5min)
-            with q_total_time:
+            c_total, c_total_time, c_avg = st.columns(3)
+            with c_total:
+                st.metric("📊 Total Computations", total_computations)
+            with c_total_time:
                 st.metric(
                     "⏱️ Total Time",
-                    f"{total_queries_time:.2f}s" if total_queries_time else "N/A",
+                    (
+                        f"{total_computations_time:.2f}s"
+                        if total_computations_time
+                        else "N/A"
+                    ),
                 )
-            with q_avg:
+            with c_avg:
                 st.metric(
-                    "⚡ Avg Time", f"{avg_query_time:.2f}s" if avg_query_time else "N/A"
+                    "⚡ Avg Time", f"{avg_comp_time:.2f}s" if avg_comp_time else "N/A"
+                )
+            show_time_distribution(
+                result_cache.get_or_compute(
+                    key + ("computation_sketch",),
+                    lambda: parser.time_sketch("computations", computations),
                 )
-            if total_queries > 0:
-                st.subheader(f"Queries Details")
-                st.dataframe(queries)
+            )
+            if total_computations > 0:
+                st.subheader(f"Computations Details")
+                show_table(computations, "computations", key + ("computations",))
 
-        except Exception as e:
-            st.error(f"❌ Failed to parse log: {e}")
-            exit(1)
-        st.markdown("---")
-    with computations_tab:
-        computations = parser.parse_computations()
-        total_computations = len(computations)
-        total_computations_time = sum(computations[parser.time_taken])
-        avg_comp_time = total_computations_time / total_computations
-        st.markdown("---")
-        st.subheader(f"Summary")
-        c_total, c_total_time, c_avg = st.columns(3)
-        with c_total:
-            st.metric("📊 Total Computations", total_computations)
-        with c_total_time:
-            st.metric(
-                "⏱️ Total Time",
-                f"{total_computations_time:.2f}s" if total_computations_time else "N/A",
+            st.markdown("---")
+        elif selected_tab == "Timeline":
+            plugins = parse_results(parser, key, "plugins")
+            queries = result_cache.get_or_compute(
+                key + ("queries",), parser.parse_queries
+            )
+            intervals = result_cache.get_or_compute(
+                key + ("intervals",),
+                lambda: {
+                    "Plugins": plugin_intervals(parser, plugins),
+                    "Queries": query_intervals(parser, queries),
+                },
+            )
+            concurrency = result_cache.get_or_compute(
+                key + ("concurrency",), lambda: concurrency_chart(intervals)
+            )
+            st.markdown("---")
+            if concurrency.empty:
+                st.info("No plugin runs or queries to place on a timeline.")
+            else:
+                st.subheader(f"Concurrency")
+                st.line_chart(concurrency)
+
+                st.subheader(f"Longest Runs")
+                # The slider works in whole seconds
+                first = concurrency.index[0].floor("s").to_pydatetime()
+                last = concurrency.index[-1].ceil("s").to_pydatetime()
+                window = st.slider(
+                    "Time window",
+                    min_value=first,
+                    max_value=last,
+                    value=(first, last),
+                    format="HH:mm:ss",
+                )
+                bars = gantt_rows(
+                    intervals,
+                    int(window[0].timestamp() * 1e9),
+                    int(window[1].timestamp() * 1e9) + 1,
+                )
+                st.altair_chart(
+                    alt.Chart(bars)
+                    .mark_bar()
+                    .encode(
+                        x="Start:T",
+                        x2="End:T",
+                        y=alt.Y("Label:N", sort=None, title=None),
+                        color="Kind:N",
+                        tooltip=["Kind", "Label", "Start", "End", "Seconds"],
+                    ),
+                    width="stretch",
+                )
+            st.markdown("---")
+        elif selected_tab == "Search":
+            index = result_cache.get_or_compute(
+                key + ("message_index",),
+                lambda: MessageIndex(parser.logs[parser.MESSAGE]),
             )
-        with c_avg:
-            st.metric(
-                "⚡ Avg Time", f"{avg_comp_time:.2f}s" if avg_comp_time else "N/A"
+            st.markdown("---")
+            query = st.text_input(
+                "Search messages",
+                key="search-query",
+                placeholder='word  prefix*  "exact phrase"',
             )
-        if total_computations > 0:
-            st.subheader(f"Computations Details")
-            st.dataframe(computations)
+            level_widget, rid_widget, thread_widget = st.columns(3)
+            with level_widget:
+                levels = st.multiselect(
+                    parser.LEVEL,
+                    parser.logs[parser.LEVEL].cat.categories,
+                    key="search-level",
+                )
+            # RIds and threads run to thousands, too many to list as options
+            with rid_widget:
+                rids = st.text_input(
+                    parser.RId, key="search-rid", placeholder="comma-separated"
+                )
+            with thread_widget:
+                threads = st.text_input(
+                    parser.THREAD, key="search-thread", placeholder="comma-separated"
+                )
+            filters = {
+                parser.LEVEL: levels,
+                parser.RId: split_values(rids),
+                parser.THREAD: split_values(threads),
+            }
+            if not query.strip() and not any(filters.values()):
+                st.info("Enter a search or a filter to list matching log lines.")
+            else:
+                search_key = key + ("search", query, *map(tuple, filters.values()))
+                hits = result_cache.get_or_compute(
+                    search_key,
+                    lambda: restrict(parser.logs, index.search(query), filters),
+                )
+                show_table(
+                    parser.logs,
+                    "search",
+                    search_key,
+                    level_column=parser.LEVEL,
+                    rows=hits,
+                    columns=[parser.TIMESTAMP, *filters, parser.MESSAGE],
+                )
+            st.markdown("---")
+        elif selected_tab == "Comparison":
+            try:
+                compare_key = upload_key(compare_file, is_warn)
+                after = result_cache.get_or_compute(
+                    compare_key + ("parser",),
+                    lambda: load_parser(compare_file, compare_key[0], is_warn),
+                )
+            except Exception as e:
+                st.error(f"❌ Failed to parse comparison log: {e}")
+                exit(1)
+
+            sections = [
+                ("plugins", compare_plugins),
+                ("queries", compare_fingerprints),
+                ("computations", compare_fingerprints),
+            ]
+            st.markdown("---")
+            try:
+                for name, compare in sections:
+                    before_results = parse_results(parser, key, name)
+                    after_results = parse_results(after, compare_key, name)
+                    comparison = result_cache.get_or_compute(
+                        key + compare_key + ("comparison", name),
+                        lambda: compare(parser, before_results, after_results),
+                    )
+                    st.subheader(f"{name.title()} Compared")
+                    st.metric(
+                        "🐢 Significant Regressions", int(comparison[REGRESSION].sum())
+                    )
+                    show_table(
+                        comparison,
+                        f"comparison-{name}",
+                        key + compare_key + ("comparison", name),
+                    )
+            except Exception as e:
+                st.error(f"❌ Failed to compare logs: {e}")
+                exit(1)
+            st.markdown("---")
 
-        st.markdown("---")
+    if show_profile:
+        show_performance_panel(profiler)
 
 
 else:
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+from pandas import DataFrame
+
+from app.batch import find_logs, main, run
+
+ROWS = [
+    ("PythonPlugin", "Started executing plug-in instance [1]: Alpha"),
+    ("Query", "Query Received: {q1}: SELECT 1"),
+    ("Query", "CPU TIME: {q1}: 1500 ms"),
+    ("Compute", "Finished computation [1]. Query : x; Computation execution time: 2 s"),
+    ("PythonPlugin", "Finished executing plug-in instance [1]: Alpha, time: 3s."),
+]
+
+
+@pytest.fixture
+def log_directory(tmp_path):
+    logs = DataFrame(ROWS, columns=["Server", "Message"])
+    logs["RId"] = "r1"
+    logs["Thread"] = "main"
+    logs["Level"] = "INFO"
+    logs["Timestamp"] = [f"2025-11-24T05:00:{i:02}.000Z" for i in range(len(ROWS))]
+    (tmp_path / "in" / "nested").mkdir(parents=True)
+    logs.to_csv(tmp_path / "in" / "first.csv", index=False)
+    logs.iloc[:3].to_csv(
+        tmp_path / "in" / "nested" / "second.CSV.gz", index=False, compression="gzip"
+    )
+    (tmp_path / "in" / "readme.txt").write_text("not a log")
+    return tmp_path
+
+
+def test_find_logs_walks_subdirectories(log_directory):
+    found = find_logs(log_directory / "in")
+
+    assert [path.name for path in found] == ["first.csv", "second.CSV.gz"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_writes_summaries_per_file(log_directory, workers):
+    output = log_directory / "out"
+    summary, failures = run(log_directory / "in", output, "csv", workers)
+
+    assert failures == []
+    assert summary["Rows"].tolist() == [5, 3]
+    assert summary["Plugins"].tolist() == [1, 1]
+    assert summary["Queries"].tolist() == [1, 1]
+    assert summary["Computations"].tolist() == [1, 0]
+    plugins = pd.read_csv(output / "first" / "plugins.csv")
+    assert plugins["PluginName"].tolist() == ["Alpha"]
+    assert (output / "nested" / "second" / "queries.csv").exists()
+
+
+def test_run_skips_summaries_written_inside_the_input(log_directory):
+    output = log_directory / "in" / "out"
+    run(log_directory / "in", output, "csv", workers=1)
+
+    summary, failures = run(log_directory / "in", output, "csv", workers=1)
+
+    assert failures == []
+    assert summary["File"].str.contains("/in/out/").tolist() == [False, False]
+    assert find_logs(log_directory / "in", exclude=output) == find_logs(
+        log_directory / "in", exclude=log_directory / "in" / "nested" / ".." / "out"
+    )
+
+
+def test_main_reports_failures_and_throughput(log_directory, capsys):
+    (log_directory / "in" / "broken.csv").write_text("a,b\n1,2\n")
+
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(log_directory / "in"), "--output", str(log_directory / "out")])
+
+    assert exit_info.value.code == 1
+    out, err = capsys.readouterr()
+    assert "broken.csv" in err
+    assert out.startswith("2 files, 8 rows in ")
+    assert pd.read_parquet(log_directory / "out" / "summary.parquet")["Rows"].sum() == 8
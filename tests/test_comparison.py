@@ -0,0 +1,116 @@
+from math import erfc, sqrt
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from app.comparison import (
+    CHANGE,
+    MEDIAN_AFTER,
+    MEDIAN_BEFORE,
+    P_VALUE,
+    REGRESSION,
+    RUNS_AFTER,
+    RUNS_BEFORE,
+    compare_fingerprints,
+    compare_plugins,
+    compare_times,
+)
+from app.log_parser import LogParser
+
+
+def brute_force_p_value(before, after):
+    """One-sided Mann-Whitney p-value from pairwise comparisons, no ties."""
+    u = sum(y > x for y in after for x in before)
+    n1, n2 = len(before), len(after)
+    z = (u - n1 * n2 / 2 - 0.5) / sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    return erfc(z / sqrt(2)) / 2
+
+
+def test_compare_times_flags_significant_slowdowns():
+    rng = np.random.default_rng(3)
+    slow_before, slow_after = rng.lognormal(0, 0.2, 25), rng.lognormal(0.5, 0.2, 25)
+    same = rng.lognormal(0, 0.2, 50)
+    before = pd.concat(
+        [
+            pd.Series(slow_before, index=["slow"] * 25),
+            pd.Series(same[:25], index=["same"] * 25),
+            pd.Series([1.0], index=["gone"]),
+        ]
+    )
+    after = pd.concat(
+        [
+            pd.Series(slow_after, index=["slow"] * 25),
+            pd.Series(same[25:], index=["same"] * 25),
+            pd.Series([2.0, np.nan], index=["new", "slow"]),
+        ]
+    )
+
+    result = compare_times(before, after)
+
+    assert result.index[0] == "slow"
+    assert result[REGRESSION].tolist() == [True, False, False, False]
+    slow = result.loc["slow"]
+    assert (slow[RUNS_BEFORE], slow[RUNS_AFTER]) == (25, 25)
+    assert slow[MEDIAN_BEFORE] == np.median(slow_before)
+    assert slow[MEDIAN_AFTER] == np.median(slow_after)
+    assert slow[P_VALUE] == brute_force_p_value(slow_before, slow_after)
+    assert result.loc["gone", RUNS_AFTER] == 0
+    assert np.isnan(result.loc["new", P_VALUE])
+    assert np.isnan(result.loc["new", CHANGE])
+
+
+def test_single_runs_are_never_significant():
+    result = compare_times(
+        pd.Series([1.0], index=["a"]), pd.Series([100.0], index=["a"])
+    )
+
+    assert result.loc["a", CHANGE] == 9900.0
+    assert not result.loc["a", REGRESSION]
+
+
+def test_compare_parse_results_by_name_and_fingerprint():
+    parser = LogParser(
+        DataFrame(columns=["Timestamp", "RId", "Thread", "Server", "Level", "Message"])
+    )
+    plugins = DataFrame({parser.plugin_name: ["A", "B"], parser.time_taken: [1.0, 2]})
+    before = DataFrame(
+        {
+            parser.MESSAGE: ["SELECT x WHERE id = 1", "SELECT x WHERE id = 2"],
+            parser.time_taken: [1.0, 3.0],
+        }
+    )
+    after = DataFrame(
+        {parser.MESSAGE: ["SELECT x WHERE id = 7"], parser.time_taken: [8.0]}
+    )
+
+    by_name = compare_plugins(parser, plugins, plugins.iloc[::-1])
+    assert by_name.index.name == parser.plugin_name
+    assert (by_name[CHANGE] == 0).all()
+
+    by_fingerprint = compare_fingerprints(parser, before, after)
+    assert len(by_fingerprint) == 1
+    assert by_fingerprint.index.name == parser.fingerprint
+    assert by_fingerprint[parser.query_pattern].iloc[0] == "SELECT x WHERE id = ?"
+    assert by_fingerprint[[RUNS_BEFORE, RUNS_AFTER]].iloc[0].tolist() == [2, 1]
+    assert by_fingerprint[CHANGE].iloc[0] == 300.0
+
+
+def test_compare_with_an_empty_side():
+    parser = LogParser(
+        DataFrame(columns=["Timestamp", "RId", "Thread", "Server", "Level", "Message"])
+    )
+    before = DataFrame(
+        {
+            parser.MESSAGE: ["SELECT x WHERE id = 1", "SELECT x WHERE id = 2"],
+            parser.time_taken: [1.0, 3.0],
+        }
+    )
+    empty = before.iloc[:0]
+
+    one_sided = compare_fingerprints(parser, before, empty)
+    assert one_sided[[RUNS_BEFORE, RUNS_AFTER]].iloc[0].tolist() == [2, 0]
+    assert np.isnan(one_sided[P_VALUE].iloc[0])
+    assert not one_sided[REGRESSION].iloc[0]
+
+    assert compare_fingerprints(parser, empty, empty).empty
@@ -0,0 +1,115 @@
+import pandas as pd
+from pandas import DataFrame
+
+from app import error_clusters
+from app.error_clusters import WILDCARD, TemplateMiner, cluster_errors, mask
+from app.log_parser import LogParser
+
+
+def test_mask_replaces_variable_parts():
+    tokens = mask(
+        "Table 'sales' row 42 id 0x1f took 1.5s at 3e4b1f2a-0000-4000-8000-00000000abcd"
+    )
+
+    assert tokens == [
+        "Table",
+        WILDCARD,
+        "row",
+        WILDCARD,
+        "id",
+        WILDCARD,
+        "took",
+        WILDCARD + "s",
+        "at",
+        WILDCARD,
+    ]
+    assert mask("   ") == [WILDCARD]
+
+
+def test_similar_messages_share_a_template():
+    miner = TemplateMiner()
+    first = miner.add("Connection to server alpha refused")
+    second = miner.add("Connection to server beta refused")
+    other = miner.add("Script failed with exit code 3")
+
+    assert first == second != other
+    clusters = miner.clusters()
+    assert clusters[error_clusters.TEMPLATE].tolist() == [
+        f"Connection to server {WILDCARD} refused",
+        f"Script failed with exit code {WILDCARD}",
+    ]
+    assert clusters[error_clusters.COUNT].tolist() == [2, 1]
+
+
+def test_counts_times_and_plugins():
+    miner = TemplateMiner()
+    times = pd.to_datetime(["2025-11-24 05:00:02", "2025-11-24 05:00:01"])
+    miner.add("Timeout after 10 ms", times[0], "Beta")
+    miner.add("Timeout after 20 ms", times[1], "Alpha")
+    miner.add("Timeout after 30 ms", None, None)
+
+    row = miner.clusters().iloc[0]
+    assert row[error_clusters.COUNT] == 3
+    assert row[error_clusters.FIRST_SEEN] == times[1]
+    assert row[error_clusters.LAST_SEEN] == times[0]
+    assert row[error_clusters.PLUGINS] == "Alpha, Beta"
+
+
+def test_plugins_are_capped(monkeypatch):
+    monkeypatch.setattr(error_clusters, "MAX_PLUGINS", 2)
+    miner = TemplateMiner()
+    for plugin in ["A", "B", "C"]:
+        miner.add("Plugin crashed", plugin=plugin)
+
+    assert miner.clusters()[error_clusters.PLUGINS].iloc[0] == "A, B, …"
+
+
+def test_least_recent_clusters_are_evicted():
+    miner = TemplateMiner(max_clusters=2)
+    first = miner.add("disk full")
+    miner.add("permission denied on write")
+    miner.add("disk full")
+    miner.add("unexpected end of stream reached now")
+
+    clusters = miner.clusters()
+    assert len(clusters) == 2
+    assert (
+        "permission denied on write" not in clusters[error_clusters.TEMPLATE].tolist()
+    )
+    # Evicted clusters leave the tree too, so a match starts a fresh cluster
+    assert miner.add("permission denied on write") != first
+    assert len(miner.clusters()) == 2
+
+
+def test_cluster_errors_attributes_plugins():
+    rows = [
+        ("INFO", "Started executing plug-in instance [1]: Alpha"),
+        ("ERROR", "Failed to read table 'sales'"),
+        ("INFO", "Finished executing plug-in instance [1]: Alpha, time: 6.0s."),
+        ("INFO", "Started executing plug-in instance [2]: Beta"),
+        ("ERROR", "Failed to read table 'units'"),
+        ("ERROR", "Script did not complete successfully for Beta"),
+        ("INFO", "Finished executing plug-in instance [2]: Beta, time: 1.0s."),
+        ("ERROR", "Failed to read table 'stock'"),
+    ]
+    data = DataFrame(rows, columns=["Level", "Message"])
+    data["RId"] = "r1"
+    data["Thread"] = "main"
+    data["Server"] = "PythonPlugin"
+    data["Timestamp"] = [f"2025-11-24T05:00:0{second}.000Z" for second in range(8)]
+    parser = LogParser(data)
+
+    clusters = cluster_errors(parser, parser.parse_plugin_sessions())
+
+    assert clusters[error_clusters.TEMPLATE].tolist() == [
+        f"Failed to read table {WILDCARD}",
+        "Script did not complete successfully for Beta",
+    ]
+    assert clusters[error_clusters.COUNT].tolist() == [3, 1]
+    assert clusters[error_clusters.PLUGINS].tolist() == ["Alpha, Beta", "Beta"]
+    assert clusters[error_clusters.FIRST_SEEN].iloc[0] == pd.Timestamp(
+        "2025-11-24T05:00:01Z"
+    )
+    assert clusters[error_clusters.LAST_SEEN].iloc[0] == pd.Timestamp(
+        "2025-11-24T05:00:07Z"
+    )
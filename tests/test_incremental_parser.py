@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas import DataFrame
+from pandas.testing import assert_frame_equal
+
+from app import incremental_parser
+from app.incremental_parser import IncrementalLogParser, LogChunks, concat_logs
+from app.log_parser import LogParser
+
+
+@pytest.fixture
+def mixed_logs():
+    """Plugin runs of two RIds, queries and a computation, in one log."""
+    rows = [
+        ("r1", "PythonPlugin", "Started executing plug-in instance [1]: Alpha"),
+        ("r1", "Query", "Query Received: {q1}: SELECT 1"),
+        ("r2", "PythonPlugin", "Started executing plug-in instance [2]: Beta"),
+        ("r1", "PythonPlugin", "Starting user code execution"),
+        ("r1", "Query", "CPU TIME: {q1}: 1500 ms"),
+        ("r2", "Query", "Query Received: {q2}: SELECT 2"),
+        ("r2", "Compute", "invocations: 3; executions: 2; non-null no ops: 1"),
+        (
+            "r2",
+            "Compute",
+            "Finished computation [1]. Query : x; Computation execution time: 2.5 s",
+        ),
+        (
+            "r1",
+            "PythonPlugin",
+            "Finished executing plug-in instance [1]: Alpha, time: 8.0s.",
+        ),
+        ("r2", "Query", "CPU TIME: {q2}: 70000 ms"),
+        (
+            "r2",
+            "PythonPlugin",
+            "Finished executing plug-in instance [2]: Beta, time: 9.0s.",
+        ),
+        ("r1", "PythonPlugin", "Started executing plug-in instance [3]: Gamma"),
+        ("r1", "Query", "Query Received: {q3}: SELECT 3"),
+    ]
+    data = DataFrame(rows, columns=["RId", "Server", "Message"])
+    data["Thread"] = "main"
+    data["Level"] = "INFO"
+    data["Timestamp"] = [f"2025-11-24T05:00:{i:02}.000Z" for i in range(len(rows))]
+    return data
+
+
+def batches(logs, *cuts):
+    bounds = [0, *cuts, len(logs)]
+    return [logs.iloc[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+@pytest.mark.parametrize("cuts", [(), (1,), (3, 9), (2, 5, 8, 11), tuple(range(1, 13))])
+def test_appended_batches_match_full_parse(mixed_logs, cuts):
+    full = LogParser(mixed_logs)
+    parser = IncrementalLogParser()
+    for batch in batches(mixed_logs, *cuts):
+        parser.append(batch)
+
+    assert_frame_equal(parser.logs, full.logs)
+    assert_frame_equal(parser.parse_plugin_summary(), full.parse_plugin_summary())
+    for session in full.parse_plugin_summary().index:
+        assert parser.plugin_logs(session).equals(full.plugin_logs(session))
+    assert_frame_equal(
+        parser.parse_queries().reset_index(drop=True),
+        full.parse_queries().reset_index(drop=True),
+    )
+    assert_frame_equal(
+        parser.parse_computations().reset_index(drop=True),
+        full.parse_computations().reset_index(drop=True),
+    )
+    for analysis in ("plugins", "queries", "computations"):
+        np.testing.assert_array_equal(
+            parser.time_sketch(analysis).quantiles([0, 0.5, 0.9, 1]),
+            full.time_sketch(analysis).quantiles([0, 0.5, 0.9, 1]),
+        )
+
+
+def test_open_plugins_and_queries_finish_in_later_batches(mixed_logs):
+    parser = IncrementalLogParser(mixed_logs.iloc[:6])
+
+    summary = parser.parse_plugin_summary()
+    assert summary[parser.plugin_name].tolist() == ["Alpha", "Beta"]
+    assert summary[parser.end_index].isna().all()
+    queries = parser.parse_queries()
+    assert queries["Message"].tolist() == ["SELECT 1", "SELECT 2"]
+    assert queries["End Executions Time"].isna().tolist() == [False, True]
+
+    parser.append(mixed_logs.iloc[6:])
+
+    summary = parser.parse_plugin_summary()
+    assert summary[parser.end_index].tolist()[:2] == [8, 10]
+    assert summary[parser.time_taken].tolist()[:2] == [8.0, 9.0]
+    assert parser.parse_queries()[parser.time_taken].tolist()[:2] == [70.0, 1.5]
+
+
+@pytest.mark.parametrize("cut", [1, 2, 3])
+def test_reused_query_ids_pair_across_batches(mixed_logs, cut):
+    logs = mixed_logs.iloc[[1, 1, 4, 4, 5, 9]].reset_index(drop=True)
+    logs["Message"] = [
+        "Query Received: {q1}: SELECT 1",
+        "Query Received: {q1}: SELECT 2",
+        "CPU TIME: {q1}: 1500 ms",
+        "CPU TIME: {q1}: 70000 ms",
+        "CPU TIME: {q1}: 3000 ms",
+        "Query Received: {q1}: SELECT 3",
+    ]
+    parser = IncrementalLogParser(logs.iloc[:cut])
+    parser.append(logs.iloc[cut:])
+
+    assert_frame_equal(
+        parser.parse_queries().reset_index(drop=True),
+        LogParser(logs).parse_queries().reset_index(drop=True),
+    )
+    assert parser.parse_queries()["Message"].tolist() == [
+        "SELECT 2",
+        "SELECT 3",
+        "SELECT 1",
+    ]
+
+
+def test_append_work_does_not_grow_with_the_log(mixed_logs, monkeypatch):
+    stacked_rows = []
+
+    def counted_concat_logs(*frames):
+        stacked_rows.append(sum(map(len, frames)))
+        return concat_logs(*frames)
+
+    def counted_concat(frames, **options):
+        frames = list(frames)
+        stacked_rows.append(sum(map(len, frames)))
+        return pd.concat(frames, **options)
+
+    work = []
+    for repeats in (2, 20):
+        parser = IncrementalLogParser(pd.concat([mixed_logs] * repeats))
+        with monkeypatch.context() as patch:
+            patch.setattr(incremental_parser, "concat_logs", counted_concat_logs)
+            patch.setattr(incremental_parser, "concat", counted_concat)
+            stacked_rows.clear()
+            parser.append(mixed_logs)
+        work.append(sum(stacked_rows))
+
+    assert work[0] == work[1]
+
+
+def test_log_chunks_stack_only_what_is_read():
+    frame = DataFrame({"Level": pd.Categorical(["INFO"] * 6)})
+    chunks = LogChunks(frame.iloc[:0])
+    for lo, hi in [(0, 2), (2, 2), (2, 4), (4, 6)]:
+        chunks.append(frame.iloc[lo:hi])
+
+    begin, tail = chunks.tail(3)
+    assert begin == 3
+    assert tail.index.tolist() == [3, 4, 5]
+    assert len(chunks) == 6
+    assert chunks.frame().index.tolist() == list(range(6))
+
+
+def test_concat_logs_merges_categories():
+    first = DataFrame({"Level": pd.Categorical(["INFO"]), "Message": ["a"]})
+    second = DataFrame({"Level": pd.Categorical(["ERROR"]), "Message": ["b"]})
+
+    stacked = concat_logs(first, second)
+
+    assert stacked["Level"].dtype == "category"
+    assert stacked["Level"].tolist() == ["INFO", "ERROR"]
+    assert stacked.index.tolist() == [0, 0]
@@ -0,0 +1,104 @@
+import io
+import threading
+
+import pandas as pd
+from pandas import DataFrame
+from app import log_cache
+from app.log_cache import LRUCache, content_hash, estimate_size
+
+
+def test_content_hash_is_stable_and_keeps_position():
+    upload = io.BytesIO(b"RId,Message\nr1,hello\n")
+    upload.seek(5)
+
+    first = content_hash(upload)
+
+    assert upload.tell() == 5
+    assert first == content_hash(io.BytesIO(b"RId,Message\nr1,hello\n"))
+    assert first != content_hash(io.BytesIO(b"RId,Message\nr1,hello!\n"))
+
+
+def test_estimate_size_counts_frames_once():
+    frame = DataFrame({"Message": ["x" * 100] * 10})
+    single = estimate_size(frame)
+
+    assert single > 1000
+    assert estimate_size({"a": frame, "b": [frame]}) < 2 * single
+
+
+def test_estimate_size_samples_object_columns(monkeypatch):
+    monkeypatch.setattr(log_cache, "SIZE_SAMPLE", 10)
+    frame = DataFrame(
+        {
+            "Message": [f"message {i:04}" for i in range(1000)],
+            "Level": pd.Categorical(["INFO", "ERROR"] * 500),
+            "Text": pd.array(["abc"] * 1000, dtype="string[pyarrow]"),
+        }
+    )
+
+    deep = frame.memory_usage(deep=True).sum()
+    assert abs(estimate_size(frame) - deep) < 0.01 * deep
+
+
+def test_get_or_compute_runs_once():
+    cache = LRUCache(max_bytes=10_000)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "result"
+
+    assert cache.get_or_compute(("hash", False), compute) == "result"
+    assert cache.get_or_compute(("hash", False), compute) == "result"
+    assert len(calls) == 1
+    assert ("hash", True) not in cache
+
+
+def test_evicts_least_recently_used_by_size():
+    cache = LRUCache(max_bytes=100)
+    cache.put("a", 1, size=40)
+    cache.put("b", 2, size=40)
+    cache.get("a")
+    cache.put("c", 3, size=40)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.current_bytes == 80
+
+
+def test_oversized_values_are_not_stored():
+    cache = LRUCache(max_bytes=100)
+
+    assert cache.put("big", "value", size=101) == "value"
+    assert len(cache) == 0
+
+
+def test_get_or_compute_waits_for_a_running_computation():
+    cache = LRUCache(max_bytes=10_000)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        calls.append("slow")
+        started.set()
+        release.wait(5)
+        return "slow"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("a", slow)))
+        for _ in range(2)
+    ]
+    threads[0].start()
+    started.wait(5)
+    threads[1].start()
+
+    # Other keys are computed while "a" is
+    assert cache.get_or_compute("b", lambda: "fast") == "fast"
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["slow", "slow"]
+    assert calls == ["slow"]
+    assert not cache._computing
@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 import pandas as pd
 from pandas import DataFrame
+from pandas.testing import assert_frame_equal
 from app.log_parser import LogParser
 
 
@@ -91,3 +93,447 @@ def test_parse_end_to_end(sample_plugin_logs):
 
     assert p["IsError"] is False
     assert p["TimeTaken (Seconds)"] == 4.0
+
+
+@pytest.fixture
+def interleaved_plugin_logs():
+    """Two RIds with overlapping sessions of the same plugin and one unfinished run."""
+    rows = [
+        ("r1", "Started executing plug-in instance [1]: Alpha"),
+        ("r2", "Started executing plug-in instance [2]: Alpha"),
+        ("r1", "Starting user code execution"),
+        ("r2", "Started executing plug-in instance [3]: Beta"),
+        ("r2", "Finished executing plug-in instance [2]: ALPHA, time: 2.0s."),
+        ("r1", "Finished executing plug-in instance [1]: Alpha, time: 3.0s."),
+        ("r1", "Started executing plug-in instance [4]: Gamma"),
+        ("r2", "Finished executing plug-in instance [3]: Beta, time: 1.0s."),
+    ]
+    data = DataFrame(rows, columns=["RId", "Message"])
+    data["Thread"] = "main"
+    data["Level"] = "INFO"
+    data["Timestamp"] = [f"2025-11-24T05:00:0{i}.000Z" for i in range(len(rows))]
+    data["Server"] = "PythonPlugin"
+    return data
+
+
+def test_match_plugin_sessions(interleaved_plugin_logs):
+    parser = LogParser(interleaved_plugin_logs)
+    sessions = parser.match_plugin_sessions(parser.filter_relevant_logs())
+
+    assert sessions == [
+        ("Alpha", "r1", 0, 4),
+        ("Alpha", "r2", 1, 5),
+        ("Beta", "r2", 3, 7),
+        ("Gamma", "r1", 6, None),
+    ]
+
+
+def test_match_plugin_sessions_filters_each_frame(interleaved_plugin_logs):
+    parser = LogParser(interleaved_plugin_logs)
+    relevant = parser.filter_relevant_logs()
+    parser.match_plugin_sessions(relevant)
+
+    later = parser.match_plugin_sessions(relevant.iloc[3:])
+
+    assert later == [("Beta", "r2", 3, 7), ("Gamma", "r1", 6, None)]
+
+
+def test_find_all_plugins_slices_by_rid(interleaved_plugin_logs):
+    parser = LogParser(interleaved_plugin_logs)
+    plugins = parser.find_all_plugins(parser.filter_relevant_logs())
+
+    assert [p[parser.time_taken] for p in plugins] == [2.0, 3.0, 1.0, None]
+    assert list(plugins[0][parser.DATA].index) == [0, 2]
+    assert list(plugins[1][parser.DATA].index) == [1, 3, 4]
+    assert plugins[3][parser.DATA].empty
+
+
+def test_low_cardinality_columns_are_categorical(interleaved_plugin_logs):
+    parser = LogParser(interleaved_plugin_logs)
+
+    for column in ["RId", "Thread", "Level", "Server"]:
+        assert parser.logs[column].dtype == "category"
+    assert parser.logs["Message"].dtype == object
+    # "ERROR" is not a category here; the filter must still work
+    assert not (parser.logs[parser.LEVEL] == parser.ERROR).any()
+    assert len(parser.filter_relevant_logs()) == len(interleaved_plugin_logs)
+
+
+def test_parse_timestamps_fast_path_matches_pandas():
+    values = pd.Series(["2025-11-24T05:00:00.000Z", "2025-11-24T05:00:01.250Z"])
+
+    parsed = LogParser.parse_timestamps(values)
+
+    assert parsed.equals(pd.to_datetime(values))
+    assert LogParser.parse_timestamps(parsed) is parsed
+
+
+def test_parse_timestamps_in_slices(monkeypatch):
+    from app import log_parser
+
+    monkeypatch.setattr(log_parser, "CHUNK_SIZE", 2)
+    values = pd.Series([f"2025-11-24T05:00:0{i}.000Z" for i in range(5)])
+
+    assert LogParser.parse_timestamps(values).equals(pd.to_datetime(values))
+    # A later slice of another shape sends the whole column to pandas
+    values[4] = "2025-11-24 05:00:04"
+    parsed = LogParser.parse_timestamps(values)
+    assert parsed.tolist() == pd.to_datetime(values, format="ISO8601").tolist()
+
+
+def test_parse_timestamps_falls_back_for_other_shapes():
+    values = pd.Series(["2025-11-24 05:00:00", None])
+
+    parsed = LogParser.parse_timestamps(values)
+
+    assert parsed[0] == pd.Timestamp("2025-11-24 05:00:00")
+    assert parsed.isna()[1]
+
+
+@pytest.fixture
+def query_logs():
+    rows = [
+        ("2025-11-24T05:00:00.000Z", "Query Received: {q1}: SELECT 1"),
+        ("2025-11-24T05:00:01.000Z", "Query Received: {q2}: SELECT 2"),
+        ("2025-11-24T05:00:02.000Z", "CPU TIME: {q2}: 1500 ms"),
+        ("2025-11-24T05:01:10.000Z", "CPU TIME: {q1}: 70000 ms"),
+    ]
+    data = DataFrame(rows, columns=["Timestamp", "Message"])
+    data["RId"] = "r1"
+    data["Thread"] = "main"
+    data["Level"] = "INFO"
+    data["Server"] = "Query"
+    return data
+
+
+def test_parse_queries_uses_parsed_timestamps(query_logs):
+    parser = LogParser(query_logs)
+    queries = parser.parse_queries()
+
+    assert queries["Message"].tolist() == ["SELECT 1", "SELECT 2"]
+    assert queries[parser.time_taken].tolist() == [70.0, 1.5]
+    assert parser.format_durations(queries[parser.time_taken]).tolist() == [
+        "01:10",
+        "00:02",
+    ]
+    assert queries["End Executions Time"].iloc[0] == pd.Timestamp(
+        "2025-11-24T05:01:10Z"
+    )
+
+
+def test_parse_queries_pairs_reused_ids_in_order(query_logs):
+    reused = query_logs.copy()
+    reused["Message"] = [
+        "Query Received: {q1}: SELECT 1",
+        "Query Received: {q1}: SELECT 2",
+        "CPU TIME: {q1}: 1500 ms",
+        "CPU TIME: {q1}: 70000 ms",
+    ]
+    parser = LogParser(reused)
+    queries = parser.parse_queries()
+
+    assert queries["Message"].tolist() == ["SELECT 2", "SELECT 1"]
+    assert queries[parser.time_taken].tolist() == [70.0, 1.5]
+
+
+@pytest.fixture
+def phased_plugin_logs():
+    rows = [
+        ("INFO", "Started executing plug-in instance [1]: Alpha"),
+        ("INFO", "Starting user code execution"),
+        ("INFO", "Successfully executed user-defined function."),
+        ("INFO", "Name of measures uploaded: Sales, Units"),
+        ("INFO", "Finished executing plug-in instance [1]: Alpha, time: 6.0s."),
+        ("INFO", "Started executing plug-in instance [2]: Beta"),
+        ("ERROR", "Script did not complete successfully for Beta"),
+        ("INFO", "Finished executing plug-in instance [2]: Beta, time: 1.0s."),
+    ]
+    data = DataFrame(rows, columns=["Level", "Message"])
+    data["RId"] = "r1"
+    data["Thread"] = "main"
+    data["Timestamp"] = [
+        "2025-11-24T05:00:00.000Z",
+        "2025-11-24T05:00:01.000Z",
+        "2025-11-24T05:00:04.000Z",
+        "2025-11-24T05:00:05.000Z",
+        "2025-11-24T05:00:06.000Z",
+        "2025-11-24T05:00:07.000Z",
+        "2025-11-24T05:00:07.500Z",
+        "2025-11-24T05:00:08.000Z",
+    ]
+    data["Server"] = "PythonPlugin"
+    return data
+
+
+def test_summarize_plugins(phased_plugin_logs):
+    parser = LogParser(phased_plugin_logs)
+    summary = parser.summarize_plugins(parser.filter_relevant_logs())
+
+    assert isinstance(summary, DataFrame)
+    assert summary[parser.plugin_name].tolist() == ["Alpha", "Beta"]
+    assert summary[parser.is_error].tolist() == [False, True]
+    assert summary[parser.READ_TIME].iloc[0] == 1.0
+    assert summary[parser.EXEC_TIME].iloc[0] == 3.0
+    assert summary[parser.WRITE_TIME].iloc[0] == 2.0
+    assert summary[parser.READ_TIME].isna().iloc[1]
+    assert summary[parser.OUTPUT_MEASURES].tolist() == ["Sales,  Units", ""]
+
+
+def test_plugin_summary_does_not_depend_on_row_order(phased_plugin_logs):
+    parser = LogParser(phased_plugin_logs)
+    logs = parser.filter_relevant_logs()
+    sessions = parser.match_plugin_sessions(logs)
+    session_ids, positions = parser.tag_plugin_sessions(
+        parser.plugin_session_rows(logs, sessions)
+    )
+    order = np.arange(len(positions))[::-1]
+
+    assert_frame_equal(
+        parser.summarize_plugin_sessions(
+            logs, sessions, session_ids[order], positions[order]
+        ),
+        parser.summarize_plugin_sessions(logs, sessions, session_ids, positions),
+    )
+
+
+def test_join_measures_per_session(phased_plugin_logs):
+    parser = LogParser(phased_plugin_logs)
+    marker = parser.measures_marker
+    messages = np.array(
+        [f"{marker} B", f"{marker} A,C ", f"{marker} D", f"{marker} A,C "],
+        dtype=object,
+    )
+
+    joined = parser.join_measures(messages, np.array([3, 1, 3, 1]))
+
+    assert joined.to_dict() == {1: "A, C", 3: "B, D"}
+    assert parser.join_measures(messages[:0], np.array([], dtype=int)).empty
+
+
+def test_find_all_plugins_matches_per_plugin_helpers(phased_plugin_logs):
+    parser = LogParser(phased_plugin_logs)
+    plugins = parser.find_all_plugins(parser.filter_relevant_logs())
+
+    for plugin in plugins:
+        times = parser.find_plugin_times(plugin[parser.DATA])
+        assert times == (
+            plugin[parser.READ_TIME],
+            plugin[parser.EXEC_TIME],
+            plugin[parser.WRITE_TIME],
+        )
+        assert parser.find_output_measures(plugin[parser.DATA]) == (
+            plugin[parser.OUTPUT_MEASURES]
+        )
+
+
+def test_classify_messages():
+    from app import log_parser
+
+    messages = pd.Series(
+        [
+            "[1]: Started executing plug-in instance Alpha",
+            "FINISHED executing plug-in instance [1]: Alpha, time: 1.0s.",
+            "Starting user code execution",
+            "starting user code execution",
+            "Storing results back to memcache",
+            "Name of measures uploaded: Sales",
+            "Query Received: {q1}: SELECT 1",
+            "CPU TIME: {q1}: 10 ms",
+            "cpu time: {q1}: 10 ms",
+            "Finished computation [1]. Query : x Computation execution time: 1.0 s",
+            "Status of the Alpha plugin run: Success",
+            "unrelated line",
+            None,
+        ]
+    )
+    parser = LogParser(
+        DataFrame({"Message": messages}).reindex(
+            columns=["RId", "Thread", "Level", "Timestamp", "Server", "Message"]
+        )
+    )
+
+    classified = parser.classify_messages(messages)
+    assert classified[parser.KIND].tolist() == [
+        log_parser.KIND_PLUGIN_START,
+        log_parser.KIND_PLUGIN_END,
+        log_parser.KIND_READ,
+        log_parser.KIND_RELEVANT,
+        log_parser.KIND_EXEC,
+        log_parser.KIND_MEASURES,
+        log_parser.KIND_QUERY_RECEIVED,
+        log_parser.KIND_QUERY_CPU,
+        log_parser.KIND_NONE,
+        log_parser.KIND_COMPUTATION,
+        log_parser.KIND_RELEVANT,
+        log_parser.KIND_NONE,
+        log_parser.KIND_NONE,
+    ]
+    assert classified[parser.RELEVANT].tolist() == [True] * 6 + [False] * 4 + [
+        True,
+        False,
+        False,
+    ]
+    assert parser.logs[[parser.KIND, parser.RELEVANT]].equals(classified)
+
+
+def test_parse_queries_pairs_by_id_in_any_order(query_logs):
+    # A CPU TIME line logged before its query, and a query never finished
+    rows = query_logs.iloc[[2, 1, 0]].reset_index(drop=True)
+    parser = LogParser(rows)
+    queries = parser.parse_queries()
+
+    assert queries["Message"].tolist() == ["SELECT 2", "SELECT 1"]
+    assert queries[parser.time_taken].iloc[0] == 1.5
+    assert queries["End Executions Time"].isna().tolist() == [False, True]
+    assert parser.format_durations(queries[parser.time_taken]).isna().tolist() == [
+        False,
+        True,
+    ]
+
+
+def test_filter_relevant_logs_checks_query_lines(query_logs):
+    query_logs.loc[1, "Message"] = "Query Received: {q2}: Data Extractor Query: x"
+    parser = LogParser(query_logs)
+
+    assert list(parser.filter_relevant_logs().index) == [1]
+    assert parser.logs[parser.RELEVANT].tolist() == [False, True, False, False]
+
+
+def test_plugin_logs_are_fetched_on_demand(interleaved_plugin_logs):
+    parser = LogParser(interleaved_plugin_logs)
+    summary = parser.parse_plugin_summary()
+
+    assert list(parser.plugin_logs(summary.index[1]).index) == [1, 3, 4]
+    # The unfinished session has no rows but keeps the log columns
+    unfinished = parser.plugin_logs(summary.index[3])
+    assert unfinished.empty
+    assert "Message" in unfinished.columns
+
+
+def test_plugin_sessions_leave_the_parser_unchanged(interleaved_plugin_logs):
+    parser = LogParser(interleaved_plugin_logs)
+    before = dict(vars(parser))
+    sessions = parser.parse_plugin_sessions()
+
+    assert vars(parser).keys() == before.keys()
+    assert all(vars(parser)[name] is value for name, value in before.items())
+    assert sessions.summary.equals(parser.parse_plugin_summary())
+    assert list(parser.plugin_logs(sessions.summary.index[1], sessions).index) == [
+        1,
+        3,
+        4,
+    ]
+
+
+def test_fingerprint_queries_normalizes_literals_and_members():
+    parser = LogParser(
+        DataFrame(columns=["RId", "Thread", "Level", "Timestamp", "Server", "Message"])
+    )
+    texts = pd.Series(
+        [
+            "Select ([Item].[Item].[123] * [Time].[Week].[W1]) on row where x > 10;",
+            "Select ([Item].[Item].[9]   * [Time].[Week].[W2]) on row where x > 2.5;",
+            "Select ([Item].[Item].filter(#.Name in {'a', 'b'})) on row;",
+            "Select ([Item].[Item].filter(#.Name in {'c'})) on row;",
+            "Select ({[Item].[Item].[A], [Item].[Item].[B]}) on row, ({Measure.[Sales]}) on column;",
+        ]
+    )
+
+    fingerprints = parser.fingerprint_queries(texts)
+
+    assert fingerprints[parser.query_pattern].tolist() == [
+        "Select ([Item].[Item].[?] * [Time].[Week].[?]) on row where x > ?;",
+        "Select ([Item].[Item].[?] * [Time].[Week].[?]) on row where x > ?;",
+        "Select ([Item].[Item].filter(#.Name in {?})) on row;",
+        "Select ([Item].[Item].filter(#.Name in {?})) on row;",
+        "Select ({[Item].[Item].[?]}) on row, ({Measure.[Sales]}) on column;",
+    ]
+    hashes = fingerprints[parser.fingerprint]
+    assert hashes[0] == hashes[1] and hashes[2] == hashes[3]
+    assert hashes.nunique() == 3
+    assert parser.fingerprint_queries(texts[:1])[parser.fingerprint][0] == hashes[0]
+
+
+def test_aggregate_queries(query_logs):
+    repeated = query_logs.copy()
+    repeated["Message"] = [
+        "Query Received: {q1}: SELECT 1",
+        "Query Received: {q2}: SELECT 2",
+        "CPU TIME: {q2}: 1500 ms",
+        "CPU TIME: {q1}: 70000 ms",
+    ]
+    parser = LogParser(repeated)
+
+    patterns = parser.aggregate_queries(parser.parse_queries())
+
+    assert len(patterns) == 1
+    row = patterns.iloc[0]
+    assert row[parser.query_pattern] == "SELECT ?"
+    assert row["Count"] == 2
+    assert row["Total Time (Seconds)"] == 71.5
+    assert row["Max Time (Seconds)"] == 70.0
+    assert row["P50 Time (Seconds)"] == 35.75
+
+
+@pytest.fixture
+def interleaved_computation_logs():
+    """Counter lines separated from their computation by other threads."""
+    rows = [
+        ("t1", "invocations: 5; executions: 4; non-null no ops: 1"),
+        ("t2", "invocations: 7; executions: 6; non-null no ops: 0"),
+        ("t2", "unrelated line"),
+        (
+            "t1",
+            "Finished computation [1]. Query : a Computation execution time: 1.0 s",
+        ),
+        (
+            "t2",
+            "Finished computation [2]. Query : b Computation execution time: 2.0 s",
+        ),
+        (
+            "t1",
+            "Finished computation [3]. Query : c Computation execution time: 3.0 s",
+        ),
+    ]
+    data = DataFrame(rows, columns=["Thread", "Message"])
+    data["RId"] = "r1"
+    data["Level"] = "INFO"
+    data["Server"] = "Compute"
+    data["Timestamp"] = [f"2025-11-24T05:00:0{i}.000Z" for i in range(len(rows))]
+    return data
+
+
+def test_parse_computations_reads_nearest_counter_line_of_thread(
+    interleaved_computation_logs,
+):
+    parser = LogParser(interleaved_computation_logs)
+    computations = parser.parse_computations().set_index("Message")
+
+    assert computations.loc["a", "Invocations Count"] == "5"
+    assert computations.loc["b", "Executions Count"] == "6"
+    # The only earlier t1 counter line belongs to computation "a"
+    assert computations.loc["c"].isna()["Invocations Count"]
+    assert computations.loc["c", parser.time_taken] == 3.0
+
+
+def test_parse_computations_without_counter_lines(interleaved_computation_logs):
+    logs = interleaved_computation_logs
+    parser = LogParser(logs[~logs["Message"].str.startswith("invocations")])
+    computations = parser.parse_computations()
+
+    assert len(computations) == 3
+    assert computations["Invocations Count"].isna().all()
+
+
+def test_find_all_plugins_records_slice_data_on_access(interleaved_plugin_logs):
+    parser = LogParser(interleaved_plugin_logs)
+    relevant = parser.filter_relevant_logs()
+    plugins = parser.find_all_plugins(relevant)
+
+    record = plugins[1]
+    assert list(record) == list(dict(record))
+    assert dict(record)[parser.plugin_name] == "Alpha"
+    assert record.get(parser.time_taken) == 3.0
+    # Each read is a fresh slice of the shared table, not a stored copy
+    assert record[parser.DATA].equals(relevant.iloc[[1, 3, 4]])
+    assert record[parser.DATA] is not record[parser.DATA]
@@ -0,0 +1,125 @@
+import gzip
+import io
+import zipfile
+
+import pyarrow as pa
+import pytest
+from pandas import DataFrame
+from pandas.errors import ParserError
+from app import log_reader
+from app.log_parser import LogParser
+from app.log_reader import LOG_COLUMNS, iter_log_chunks, open_log, read_log
+
+CSV = (
+    "Timestamp,Level,Logger,Server,RId,Thread,Message\n"
+    "2025-11-24T05:00:00.000Z,INFO,x,PythonPlugin,r1,t1,first\n"
+    "2025-11-24T05:00:01.000Z,INFO,x,PythonPlugin,r1,t1,bad,extra,fields\n"
+    '2025-11-24T05:00:02.000Z,ERROR,x,PythonPlugin,r2,t1,"quoted, message"\n'
+    "2025-11-24T05:00:03.000Z,INFO,x,PythonPlugin,r2,t1,last\n"
+)
+
+
+def test_log_columns_match_parser():
+    parser = LogParser(DataFrame(columns=LOG_COLUMNS))
+    assert parser.input_columns == LOG_COLUMNS
+
+
+def test_read_log_projects_and_skips_bad_lines():
+    logs = read_log(io.BytesIO(CSV.encode()))
+
+    assert sorted(logs.columns) == sorted(LOG_COLUMNS)
+    assert logs["Message"].tolist() == ["first", "quoted, message", "last"]
+    assert list(logs.index) == [0, 1, 2]
+
+
+def test_iter_log_chunks_yields_bounded_chunks():
+    chunks = list(iter_log_chunks(io.StringIO(CSV), chunksize=2))
+
+    assert sum(len(chunk) for chunk in chunks) == 3
+    assert all(len(chunk) <= 2 for chunk in chunks)
+    assert all("Logger" not in chunk.columns for chunk in chunks)
+
+
+def test_python_engine_fallback_rereads_from_the_start(monkeypatch):
+    read_csv = log_reader.read_csv
+
+    def failing_c_engine(stream, engine, **options):
+        reader = read_csv(stream, engine=engine, **options)
+        if engine != "c":
+            return reader
+
+        class Failing:
+            # One chunk that splits rows unlike the python engine, then a failure
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                reader.close()
+
+            def __iter__(self):
+                yield next(reader).iloc[1:]
+                raise ParserError("C error")
+
+        return Failing()
+
+    monkeypatch.setattr(log_reader, "read_csv", failing_c_engine)
+    logs = read_log(io.BytesIO(CSV.encode()), chunksize=2)
+
+    assert logs["Message"].tolist() == ["first", "quoted, message", "last"]
+
+
+def compressed(kind: str, data: bytes) -> bytes:
+    if kind == "gzip":
+        return gzip.compress(data)
+    if kind == "zstd":
+        sink = pa.BufferOutputStream()
+        with pa.CompressedOutputStream(sink, "zstd") as stream:
+            stream.write(data)
+        return sink.getvalue().to_pybytes()
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zipped:
+        zipped.writestr("readme.txt", "not the log")
+        zipped.writestr("export/log.csv", data)
+    return archive.getvalue()
+
+
+@pytest.mark.parametrize("kind", ["gzip", "zstd", "zip"])
+def test_read_log_decompresses_uploads(kind):
+    upload = io.BytesIO(compressed(kind, CSV.encode()))
+
+    logs = read_log(upload)
+    assert logs.equals(read_log(io.BytesIO(CSV.encode())))
+
+
+def test_open_log_rejects_zip_without_csv():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zipped:
+        zipped.writestr("readme.txt", "not the log")
+
+    with pytest.raises(ValueError, match="no CSV"):
+        open_log(io.BytesIO(archive.getvalue()))
+
+
+def test_zip_archive_is_closed_with_its_member(monkeypatch):
+    archives = []
+
+    class Recorded(zipfile.ZipFile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            archives.append(self)
+
+    upload = io.BytesIO(compressed("zip", CSV.encode()))
+    monkeypatch.setattr(zipfile, "ZipFile", Recorded)
+
+    assert len(read_log(upload)) == 3
+    assert [archive.fp for archive in archives] == [None]
+    assert archives[0]._fileRefCnt == 0
+    assert not upload.closed
+
+
+def test_open_log_passes_plain_files_through():
+    upload = io.BytesIO(CSV.encode())
+    upload.seek(10)
+
+    assert open_log(upload) is upload
+    assert upload.tell() == 10
@@ -0,0 +1,92 @@
+import io
+from functools import partial
+
+import pytest
+from app import log_store
+from app.log_parser import LogParser
+
+CSV = (
+    "Timestamp,Level,Server,RId,Thread,Message\n"
+    "2025-11-24T05:00:00.000Z,INFO,PythonPlugin,r1,t1,"
+    "Started executing plug-in instance [1]: Alpha\n"
+    "2025-11-24T05:00:01.000Z,INFO,PythonPlugin,r1,t1,Starting user code execution\n"
+    "2025-11-24T05:00:04.000Z,INFO,PythonPlugin,r1,t1,"
+    '"Finished executing plug-in instance [1]: Alpha, time: 4.0s."\n'
+)
+
+
+@pytest.fixture(autouse=True)
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_store, "STORE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_round_trip_keeps_types():
+    parser = LogParser(log_store.read_log(io.StringIO(CSV)))
+    log_store.save_log_table("abc", parser.logs)
+
+    loaded = log_store.load_log_table("abc")
+
+    assert loaded["Message"].dtype == "string[pyarrow]"
+    others = parser.logs.columns.drop("Message")
+    assert loaded[others].dtypes.equals(parser.logs[others].dtypes)
+    assert loaded.astype(object).equals(parser.logs.astype(object))
+
+
+def test_load_parser_reuses_saved_table(monkeypatch):
+    first = log_store.load_parser(io.StringIO(CSV), "abc")
+
+    def fail(_file):
+        raise AssertionError("CSV was parsed again")
+
+    monkeypatch.setattr(log_store, "read_log", fail)
+    second = log_store.load_parser(io.StringIO(CSV), "abc")
+
+    assert second.parse_plugin_summary().equals(first.parse_plugin_summary())
+
+
+def test_missing_or_corrupt_tables_are_ignored(store_dir):
+    assert log_store.load_log_table("missing") is None
+
+    with open(log_store.store_path("bad"), "wb") as f:
+        f.write(b"not arrow")
+    assert log_store.load_log_table("bad") is None
+    assert not (store_dir / "bad.v1.arrow").exists()
+
+
+def test_prune_store_keeps_recent_tables():
+    parser = LogParser(log_store.read_log(io.StringIO(CSV)))
+    log_store.save_log_table("old", parser.logs)
+    log_store.save_log_table("new", parser.logs)
+
+    log_store.prune_store(max_bytes=1)
+
+    assert log_store.load_log_table("old") is None
+
+
+def test_saving_never_prunes_the_new_table(monkeypatch):
+    parser = LogParser(log_store.read_log(io.StringIO(CSV)))
+    monkeypatch.setattr(
+        log_store, "prune_store", partial(log_store.prune_store, max_bytes=1)
+    )
+
+    log_store.save_log_table("big", parser.logs)
+
+    assert log_store.load_log_table("big") is not None
+
+
+def test_load_parser_caps_workers(monkeypatch):
+    used = []
+
+    class Recorder(LogParser):
+        def __init__(self, logs, is_warn=False, workers=1):
+            used.append(workers)
+            super().__init__(logs, is_warn)
+
+    monkeypatch.setattr(log_store, "LogParser", Recorder)
+    monkeypatch.setattr(log_store, "SERVER_WORKERS", 3)
+    log_store.load_parser(io.StringIO(CSV), "small")
+    monkeypatch.setattr(log_store, "MIN_PARALLEL_ROWS", 1)
+    log_store.load_parser(io.StringIO(CSV), "large")
+
+    assert used == [1, 3]
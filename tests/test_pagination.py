@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from app.pagination import (
+    level_styles,
+    matching_rows,
+    page_count,
+    page_rows,
+    sorted_rows,
+)
+
+
+def table():
+    return DataFrame(
+        {
+            "Level": pd.Categorical(["INFO", "ERROR", None, "WARN", "info"]),
+            "Message": ["Reading input", np.nan, "read done", "slow READ", 7],
+            "Seconds": [3.0, 1.0, np.nan, 1.0, 2.0],
+            "Empty": [np.nan] * 5,
+        },
+        index=[10, 11, 12, 13, 14],
+    )
+
+
+def test_matching_rows_ignores_case_across_text_columns():
+    frame = table()
+
+    np.testing.assert_array_equal(matching_rows(frame, "read"), [0, 2, 3])
+    np.testing.assert_array_equal(matching_rows(frame, "info"), [0, 4])
+    np.testing.assert_array_equal(matching_rows(frame, "missing"), [])
+    np.testing.assert_array_equal(matching_rows(frame, ""), range(5))
+
+
+def test_matching_rows_within_given_rows_and_columns():
+    frame = table()
+    rows = np.array([4, 3, 0])
+
+    np.testing.assert_array_equal(matching_rows(frame, "read", rows), [3, 0])
+    np.testing.assert_array_equal(matching_rows(frame, "info", rows), [4, 0])
+    np.testing.assert_array_equal(
+        matching_rows(frame, "info", rows, columns=["Message"]), []
+    )
+    np.testing.assert_array_equal(matching_rows(frame, "", rows), rows)
+
+
+def test_sorted_rows_keep_ties_and_put_missing_last():
+    frame = table()
+
+    np.testing.assert_array_equal(
+        sorted_rows(frame, np.arange(5), "Seconds"), [1, 3, 4, 0, 2]
+    )
+    np.testing.assert_array_equal(
+        sorted_rows(frame, np.array([0, 1, 2, 3]), "Seconds", ascending=False),
+        [0, 1, 3, 2],
+    )
+
+
+def test_pages_cover_every_row_once():
+    positions = np.arange(250)
+
+    assert page_count(250, 100) == 3
+    assert page_count(0, 100) == 1
+    pages = [page_rows(positions, page, 100) for page in range(1, 4)]
+    np.testing.assert_array_equal(np.concatenate(pages), positions)
+    assert len(pages[-1]) == 50
+
+
+def test_level_styles_colour_whole_rows():
+    frame = table()
+    styles = level_styles(frame, "Level")
+
+    assert styles.index.equals(frame.index)
+    assert styles.columns.equals(frame.columns)
+    assert set(styles.loc[11]) == {"color: #C30B0B"}
+    assert set(styles.loc[13]) == {"color: #C3A50D"}
+    assert set(styles.loc[[10, 12, 14]].to_numpy().ravel()) == {""}
+    frame.style.apply(lambda _: styles, axis=None).to_html()
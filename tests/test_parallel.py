@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from pandas import DataFrame
+
+from app import log_parser
+from app.log_parser import LogParser
+from app.parallel import SharedStrings, read_shared_strings, row_ranges
+
+MESSAGES = [
+    "Started executing plug-in instance [1]: Alpha",
+    "STARTED EXECUTING PLUG-IN INSTANCE [2]: Beta",
+    "Query Received: {q1}: select",
+    "CPU TIME: {q1}: 12 ms",
+    "invocations: 1; executions: 1; non-null no ops: 0",
+    "Finished computation [1]. Query : x; Computation execution time: 1.5 s",
+    "Writing output data to files / tables",
+    "İstanbul Starting user code execution",
+    None,
+    "",
+    "plain noise",
+]
+
+
+def test_row_ranges_cover_all_rows():
+    assert row_ranges(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert row_ranges(2, 8) == [(0, 1), (1, 2)]
+    assert row_ranges(0, 4) == []
+
+
+def test_shared_strings_round_trip():
+    with SharedStrings(MESSAGES) as shared:
+        assert read_shared_strings(shared.spec, 0, len(MESSAGES)) == MESSAGES
+        assert read_shared_strings(shared.spec, 2, 4) == MESSAGES[2:4]
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_classification_matches_serial(monkeypatch, workers):
+    messages = MESSAGES * 50
+    logs = DataFrame(
+        {
+            "Timestamp": "2025-11-24T05:00:00.000Z",
+            "Level": "INFO",
+            "Server": "WebApi",
+            "RId": "r1",
+            "Thread": "t1",
+            "Message": messages,
+        }
+    )
+    serial = LogParser(logs)
+    monkeypatch.setattr(log_parser, "MIN_PARALLEL_ROWS", 1)
+    parallel = LogParser(logs, workers=workers)
+
+    assert np.array_equal(
+        parallel.logs[parallel.KIND].to_numpy(), serial.logs[serial.KIND].to_numpy()
+    )
+    assert parallel.logs[parallel.KIND].index.equals(serial.logs.index)
@@ -0,0 +1,58 @@
+import json
+
+from app.profiler import Profiler, active_profiler, profiled, span
+
+
+@profiled
+def inner():
+    return sum(range(1000))
+
+
+@profiled
+def outer():
+    with span("allocate"):
+        data = [0] * 200_000
+    return inner() + len(data)
+
+
+def test_no_spans_without_active_profiler():
+    assert active_profiler() is None
+    assert outer() == sum(range(1000)) + 200_000
+
+
+def test_nested_spans_are_recorded():
+    with Profiler() as profiler:
+        outer()
+        inner()
+
+    assert [(s.name, s.depth) for s in profiler.spans] == [
+        ("outer", 0),
+        ("allocate", 1),
+        ("inner", 1),
+        ("inner", 0),
+    ]
+    assert all(s.wall >= 0 and s.cpu >= 0 for s in profiler.spans)
+    assert profiler.spans[0].wall >= profiler.spans[1].wall
+    assert active_profiler() is None
+
+    summary = profiler.summary()
+    assert summary.loc["inner", "Calls"] == 2
+
+
+def test_peak_memory_propagates_to_parents():
+    with Profiler(trace_memory=True) as profiler:
+        outer()
+
+    outer_span, allocate_span = profiler.spans[0], profiler.spans[1]
+    assert allocate_span.peak_bytes > 1_000_000
+    assert outer_span.peak_bytes >= allocate_span.peak_bytes
+
+
+def test_chrome_trace_export():
+    with Profiler() as profiler:
+        outer()
+
+    trace = json.loads(profiler.to_json())
+    events = trace["traceEvents"]
+    assert [event["name"] for event in events] == ["outer", "allocate", "inner"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
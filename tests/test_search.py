@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas import DataFrame, Series
+
+from app.log_cache import estimate_size
+from app.search import MessageIndex, restrict, split_values
+
+MESSAGES = [
+    "Started executing plug-in instance [1]: Alpha",
+    "Query Received: {q1}: SELECT revenue FROM sales",
+    "Started executing plug-in instance [2]: Alphabet",
+    None,
+    "Script did not complete successfully for Alpha",
+    "Query Received: {q1}: SELECT revenue FROM sales",
+    "plug in, instance of ALPHA",
+    "",
+]
+
+
+@pytest.fixture
+def index():
+    return MessageIndex(Series(MESSAGES, dtype=object))
+
+
+@pytest.mark.parametrize(
+    "query, rows",
+    [
+        ("alpha", [0, 4, 6]),
+        ("ALPHA*", [0, 2, 4, 6]),
+        ("revenue", [1, 5]),
+        ('"plug-in instance"', [0, 2, 6]),
+        ('"plug in instance"', [0, 2, 6]),
+        ('"instance plug"', []),
+        ('"plug-in instance" alpha*', [0, 2, 6]),
+        ('"executing plug" alpha', [0]),
+        ("select sales", [1, 5]),
+        ("{q1}:", [1, 5]),
+        ("missing", []),
+        ("alpha missing*", []),
+    ],
+)
+def test_search_term_prefix_and_phrase(index, query, rows):
+    np.testing.assert_array_equal(index.search(query), rows)
+
+
+def test_empty_query_matches_every_row(index):
+    np.testing.assert_array_equal(index.search("  "), range(len(MESSAGES)))
+
+
+@pytest.mark.parametrize("query", ["!!", "*", '""', "- !"])
+def test_query_without_words_matches_nothing(index, query):
+    np.testing.assert_array_equal(index.search(query), [])
+
+
+def test_index_size_counts_its_arrays_and_vocabulary():
+    messages = Series([f"message {i} of the log" for i in range(2000)])
+    index = MessageIndex(messages)
+
+    assert index.nbytes > index._texts.nbytes + index.vocabulary.nbytes
+    assert estimate_size({"index": index}) >= index.nbytes
+    assert MessageIndex(Series([], dtype=object)).nbytes >= 0
+
+
+def test_vocabulary_is_sorted_and_lower_case(index):
+    assert list(index.vocabulary) == sorted(index.vocabulary)
+    assert "alphabet" in index.vocabulary
+    assert "" not in index.vocabulary
+
+
+def test_restrict_filters_categorical_and_plain_columns():
+    logs = DataFrame(
+        {
+            "Level": pd.Categorical(["INFO", "ERROR", "WARN", "ERROR"]),
+            "Thread": ["t1", "t2", "t1", "t1"],
+        }
+    )
+    rows = np.arange(4)
+
+    np.testing.assert_array_equal(
+        restrict(logs, rows, {"Level": ["ERROR", "FATAL"]}), [1, 3]
+    )
+    np.testing.assert_array_equal(
+        restrict(logs, rows, {"Level": ["ERROR"], "Thread": ["t1"]}), [3]
+    )
+    np.testing.assert_array_equal(restrict(logs, rows, {"Level": []}), rows)
+
+
+def test_split_values_drops_blanks():
+    assert split_values(" r1, r2 ,,") == ["r1", "r2"]
+    assert split_values("  ") == []
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from app.sketch import QuantileSketch
+
+QUANTILES = [0, 0.01, 0.25, 0.5, 0.9, 0.99, 1]
+
+
+@pytest.fixture
+def durations():
+    rng = np.random.default_rng(7)
+    return np.concatenate([rng.lognormal(0, 2, 50_000), [0.0, 0.0, np.nan]])
+
+
+def test_quantiles_within_relative_accuracy(durations):
+    sketch = QuantileSketch.from_values(durations, accuracy=0.01)
+    exact = np.quantile(durations[~np.isnan(durations)], QUANTILES, method="lower")
+
+    assert sketch.count == len(durations) - 1
+    np.testing.assert_allclose(sketch.quantiles(QUANTILES), exact, rtol=0.01)
+    assert sketch.quantile(0) == 0.0
+    assert sketch.quantile(1) == np.nanmax(durations)
+
+
+def test_merged_chunks_match_one_sketch(durations):
+    whole = QuantileSketch.from_values(durations)
+    merged = QuantileSketch()
+    for chunk in np.array_split(durations, 7):
+        merged.merge(QuantileSketch.from_values(chunk))
+
+    assert merged.count == whole.count
+    assert merged.sum == pytest.approx(whole.sum)
+    np.testing.assert_array_equal(
+        merged.quantiles(QUANTILES), whole.quantiles(QUANTILES)
+    )
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(accuracy=0.05))
+
+
+def test_negative_values_sort_below_zero():
+    sketch = QuantileSketch.from_values([-100.0, -1.0, 0.0, 1.0, 100.0])
+
+    np.testing.assert_allclose(
+        sketch.quantiles([0, 0.25, 0.5, 0.75, 1]), [-100, -1, 0, 1, 100], rtol=0.01
+    )
+
+
+def test_histogram_counts_every_value(durations):
+    histogram = QuantileSketch.from_values(durations).histogram(bins=20)
+
+    assert len(histogram) <= 20
+    assert histogram["Count"].sum() == len(durations) - 1
+    assert histogram["From"].is_monotonic_increasing
+
+
+def test_empty_sketch():
+    sketch = QuantileSketch()
+
+    assert np.isnan(sketch.quantile(0.5))
+    assert np.isnan(sketch.mean)
+    assert sketch.histogram().empty
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from app.log_parser import LogParser
+from app.timeline import (
+    Intervals,
+    concurrency_chart,
+    gantt_rows,
+    plugin_intervals,
+    query_intervals,
+    time_edges,
+)
+
+
+def at(seconds):
+    return pd.Timestamp("2025-11-24T05:00:00Z") + pd.to_timedelta(seconds, unit="s")
+
+
+def seconds_intervals(pairs, labels=None):
+    starts = pd.Series([at(start) for start, _ in pairs])
+    ends = pd.Series([pd.NaT if end is None else at(end) for _, end in pairs])
+    return Intervals(starts, ends, labels)
+
+
+def brute_force_level(pairs, second):
+    return sum(start <= second < end for start, end in pairs)
+
+
+def test_concurrency_counts_running_intervals():
+    pairs = [(0, 4), (1, 2), (2, 5), (5, 6)]
+    profile = seconds_intervals(pairs).concurrency()
+
+    # Touching intervals hand over without a spike
+    assert profile["Concurrency"].tolist() == [1, 2, 2, 1, 1, 0]
+    for time, level in zip(profile["Time"], profile["Concurrency"]):
+        assert level == brute_force_level(pairs, (time - at(0)).total_seconds())
+
+
+def test_intervals_skip_missing_times_and_query_overlaps():
+    intervals = seconds_intervals([(3, 5), (0, None), (0, 2)], ["a", "b", "c"])
+
+    assert len(intervals) == 2
+    assert intervals.labels.tolist() == ["c", "a"]
+    assert intervals.active_at(time_edges(at(0).value, at(4).value, 4)).tolist() == [
+        1,
+        1,
+        0,
+        1,
+        1,
+    ]
+    assert intervals.overlapping(at(2).value, at(3).value).tolist() == []
+    assert intervals.overlapping(at(1).value, at(4).value).tolist() == [0, 1]
+
+
+def test_peak_concurrency_keeps_spikes_between_bucket_edges():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 1000, 300)
+    pairs = list(zip(starts, starts + rng.integers(1, 50, 300)))
+    intervals = seconds_intervals(pairs)
+    edges = time_edges(*intervals.span(), 10)
+
+    peaks = intervals.peak_concurrency(edges)
+    for bucket, peak in enumerate(peaks):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        seconds = range((lo - at(0).value) // 10**9, -(-(hi - at(0).value) // 10**9))
+        assert peak == max(brute_force_level(pairs, second) for second in seconds)
+
+
+def test_concurrency_chart_shares_buckets_across_series():
+    chart = concurrency_chart(
+        {
+            "Plugins": seconds_intervals([(0, 10)]),
+            "Queries": seconds_intervals([(5, 20), (6, 7)]),
+        },
+        points=4,
+    )
+
+    assert chart.index[0] == at(0)
+    assert chart["Plugins"].tolist() == [1, 1, 0, 0]
+    assert chart["Queries"].tolist() == [0, 2, 1, 1]
+
+
+def test_gantt_rows_keep_longest_overlapping_intervals():
+    series = {
+        "Plugins": seconds_intervals([(0, 10), (12, 13)], ["long", "late"]),
+        "Queries": seconds_intervals([(1, 3), (2, 9)], ["q1", "q2"]),
+    }
+
+    rows = gantt_rows(series, at(0).value, at(11).value, limit=2)
+    assert rows["Label"].tolist() == ["long", "q2"]
+    assert rows["Seconds"].tolist() == [10.0, 7.0]
+    assert gantt_rows(series, at(30).value, at(40).value).empty
+
+
+def test_intervals_from_parse_results():
+    rows = [
+        ("PythonPlugin", "Started executing plug-in instance [1]: Alpha"),
+        ("Query", "Query Received: {q1}: SELECT 1"),
+        ("Query", "CPU TIME: {q1}: 1000 ms"),
+        ("PythonPlugin", "Finished executing plug-in instance [1]: Alpha, time: 3s."),
+        ("PythonPlugin", "Started executing plug-in instance [2]: Beta"),
+        ("Query", "Query Received: {q2}: SELECT 2"),
+    ]
+    logs = DataFrame(rows, columns=["Server", "Message"])
+    logs["RId"] = "r1"
+    logs["Thread"] = "main"
+    logs["Level"] = "INFO"
+    logs["Timestamp"] = [f"2025-11-24T05:00:{i:02}.000Z" for i in range(len(rows))]
+    parser = LogParser(logs)
+
+    plugins = plugin_intervals(parser, parser.parse_plugin_summary())
+    queries = query_intervals(parser, parser.parse_queries())
+
+    # Unfinished runs last until the final log line
+    assert plugins.labels.tolist() == ["Alpha", "Beta"]
+    assert plugins.starts.tolist() == [at(0).value, at(4).value]
+    assert plugins.ends.tolist() == [at(3).value, at(5).value]
+    assert queries.starts.tolist() == [at(1).value, at(5).value]
+    assert queries.ends.tolist() == [at(2).value, at(5).value]